@@ -1,35 +1,127 @@
 # app.py
 """Compañero de Estudio de Bioquímica - Aplicación Streamlit."""
+import logging
 import os
+import random
 import re
+import uuid
 import requests
 import streamlit as st
+from requests.adapters import HTTPAdapter
 from streamlit_lottie import st_lottie
 from streamlit_mermaid import st_mermaid
 
+from core.chat_store import ChatStore
+from core.client import get_client, warm_up
+from core.prompts import PROMPTS
+from core.query_validator import CANNED_REPLIES, is_small_talk
+from core.rag_manager import RAGManager
+from core.response_cache import ResponseCache, make_key
+from core.semantic_cache import SemanticCache, generates_study_set, is_semantically_cacheable
+from core.tool_configs import build_config
+from core.tool_router import select_tools
+from core.tools import (
+    calculate_ph, enzyme_kinetics, isoelectric_point,
+    create_flashcards, create_exam
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Sesión HTTP persistente (keep-alive) para recursos externos
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
 
-@st.cache_data
+
+@st.cache_resource(ttl=86400, show_spinner=False)
 def load_lottie_url(url: str):
-    """Cargar animación Lottie desde URL."""
+    """Cargar animación Lottie desde URL (compartida entre sesiones)."""
+    try:
+        r = _SESSION.get(url, timeout=3)
+    except requests.RequestException as e:
+        logger.warning("No se pudo descargar la animación %s: %s", url, e)
+        return None
+    if r.status_code != 200:
+        return None
     try:
-        r = requests.get(url)
-        if r.status_code != 200:
-            return None
         return r.json()
-    except Exception:
+    except ValueError as e:
+        logger.warning("Animación Lottie inválida en %s: %s", url, e)
         return None
 
 
 # URL de animación de Rosalind (robot/asistente animado)
 ROSALIND_ANIMATION = "https://assets5.lottiefiles.com/packages/lf20_tutvdkg0.json"
 
+# Modelo usado para generar respuestas
+MODEL_NAME = "gemini-3-pro-preview"
+
+# Personalidad de la tutora y su prompt del sistema
+# (una PERSONA desconocida vuelve a Rosalind en vez de romper la app)
+DEFAULT_PERSONA = "rosalind"
+PERSONA = os.environ.get("PERSONA", DEFAULT_PERSONA)
+if PERSONA not in PROMPTS:
+    PERSONA = DEFAULT_PERSONA
+SYSTEM_INSTRUCTION = PROMPTS[PERSONA]
+
+# Mensajes del historial que se mantienen en memoria y se muestran por página
+HISTORY_WINDOW = 20
+
+
+@st.cache_resource(show_spinner=False)
+def load_client():
+    """Cliente de Gemini compartido por todas las sesiones."""
+    client = get_client()
+    warm_up(client)
+    return client
+
+
+@st.cache_resource(show_spinner=False)
+def load_rag_manager(_client, store_name_override):
+    """Gestor RAG compartido, con el almacén de documentos ya cargado."""
+    rag_manager = RAGManager(_client)
+    rag_manager.load_existing_store(store_name_override)
+    return rag_manager
+
+
+@st.cache_resource
+def get_chat_store():
+    """Historial de chat en SQLite compartido por todas las sesiones."""
+    return ChatStore()
+
+
+def add_message(role: str, content: str):
+    """Guardar un mensaje en disco y mantener en memoria solo la ventana reciente."""
+    get_chat_store().append(st.session_state.session_id, role, content)
+    st.session_state.messages.append({"role": role, "content": content})
+    del st.session_state.messages[:-HISTORY_WINDOW]
+
+
+@st.cache_resource
+def get_response_cache():
+    """Caché de respuestas compartida por todas las sesiones."""
+    return ResponseCache()
+
+
+@st.cache_resource
+def get_semantic_cache(_client):
+    """Caché semántica compartida para preguntas parafraseadas."""
+    return SemanticCache(_client)
+
+
+# Pattern to match ```mermaid ... ``` blocks
+_MERMAID_RE = re.compile(r'```mermaid\s*([\s\S]*?)```')
+
+
+@st.cache_data(show_spinner=False, max_entries=512)
+def split_mermaid_blocks(content: str) -> list[str]:
+    """Split message content into alternating text and Mermaid parts."""
+    return _MERMAID_RE.split(content)
+
 
 def render_message_with_diagrams(content: str):
     """Render message content, converting Mermaid blocks to diagrams."""
-    # Pattern to match ```mermaid ... ``` blocks
-    pattern = r'```mermaid\s*([\s\S]*?)```'
-
-    parts = re.split(pattern, content)
+    parts = split_mermaid_blocks(content)
 
     for i, part in enumerate(parts):
         if i % 2 == 0:
@@ -41,6 +133,28 @@ def render_message_with_diagrams(content: str):
             st_mermaid(part.strip())
 
 
+def stream_response(stream, placeholder) -> tuple[str, object]:
+    """Show a streamed response as it arrives; return its text and last chunk."""
+    chunks = []
+
+    def text_chunks():
+        for chunk in stream:
+            chunks.append(chunk)
+            if chunk.text:
+                yield chunk.text
+
+    with placeholder.container():
+        st.write_stream(text_chunks())
+
+    # Mermaid diagrams can only be drawn once the block is complete
+    text = "".join(chunk.text for chunk in chunks if chunk.text)
+    if _MERMAID_RE.search(text):
+        with placeholder.container():
+            render_message_with_diagrams(text)
+
+    return text, (chunks[-1] if chunks else None)
+
+
 # Configuración de página
 st.set_page_config(
     page_title="Rosalind - Tu Tutora de Bioquímica",
@@ -56,32 +170,48 @@ except KeyError:
     st.error("Falta la API key. Crea `.streamlit/secrets.toml` con:\n\n```\nGOOGLE_API_KEY = \"tu_api_key_aqui\"\n```")
     st.stop()
 
-# Session state initialization
-if "messages" not in st.session_state:
-    st.session_state.messages = []
-if "client" not in st.session_state:
-    st.session_state.client = None
-if "rag_manager" not in st.session_state:
-    st.session_state.rag_manager = None
-if "store_loaded" not in st.session_state:
-    st.session_state.store_loaded = False
-
-# Inicializar cliente una vez
-if st.session_state.client is None:
-    from core.client import get_client
-    from core.rag_manager import RAGManager
+# Session state initialization (solo estado propio de cada usuaria)
+st.session_state.setdefault("messages", [])
+st.session_state.setdefault("session_id", uuid.uuid4().hex)
+st.session_state.setdefault("older_shown", 0)
+
+# Cliente y almacén de documentos compartidos entre sesiones
+try:
+    client = load_client()
+    # Intentar cargar almacén de documentos existente
+    # Primero intenta desde secrets (para cloud), luego desde archivo local
+    rag_manager = load_rag_manager(client, st.secrets.get("RAG_STORE_NAME", None))
+except Exception as e:
+    st.error(f"Error de conexión: {e}")
+    st.stop()
+store_loaded = rag_manager.store is not None
+if not store_loaded:
+    # No guardar un gestor sin almacén: la próxima sesión vuelve a intentarlo
+    # (p. ej. tras un error transitorio o al terminar index_pdfs.py)
+    load_rag_manager.clear()
+
+# Toggles de herramientas (por defecto todas activas)
+TOOL_TOGGLES = ("use_ph_calc", "use_kinetics", "use_pi_calc", "use_flashcards", "use_exam")
+for toggle in TOOL_TOGGLES:
+    st.session_state.setdefault(toggle, True)
+
+
+@st.fragment
+def tool_toggles():
+    """Toggles de herramientas: al cambiarlos solo se re-ejecuta este fragmento."""
+    # Herramientas de cálculo
+    st.subheader("Calculadoras")
+    st.checkbox("Calculadora de pH", key="use_ph_calc")
+    st.checkbox("Cinética Enzimática", key="use_kinetics")
+    st.checkbox("Punto Isoeléctrico", key="use_pi_calc")
+
+    st.divider()
+
+    # Herramientas de estudio
+    st.subheader("Herramientas de Estudio")
+    st.checkbox("Generador de Flashcards", key="use_flashcards")
+    st.checkbox("Generador de Exámenes", key="use_exam")
 
-    try:
-        st.session_state.client = get_client()
-        st.session_state.rag_manager = RAGManager(st.session_state.client)
-        # Intentar cargar almacén de documentos existente
-        # Primero intenta desde secrets (para cloud), luego desde archivo local
-        store_name_from_secrets = st.secrets.get("RAG_STORE_NAME", None)
-        if st.session_state.rag_manager.load_existing_store(store_name_from_secrets):
-            st.session_state.store_loaded = True
-    except Exception as e:
-        st.error(f"Error de conexión: {e}")
-        st.stop()
 
 # Barra lateral
 with st.sidebar:
@@ -89,8 +219,8 @@ with st.sidebar:
     st.success("¡Conectado a Gemini!")
 
     # Mostrar estado del almacén de documentos
-    if st.session_state.store_loaded and st.session_state.rag_manager:
-        doc_count = st.session_state.rag_manager.get_document_count()
+    if store_loaded:
+        doc_count = rag_manager.get_document_count()
         if doc_count > 0:
             st.info(f"📚 {doc_count} documentos listos")
         else:
@@ -100,18 +230,7 @@ with st.sidebar:
 
     st.divider()
 
-    # Herramientas de cálculo
-    st.subheader("Calculadoras")
-    use_ph_calc = st.checkbox("Calculadora de pH", value=True)
-    use_kinetics = st.checkbox("Cinética Enzimática", value=True)
-    use_pi_calc = st.checkbox("Punto Isoeléctrico", value=True)
-
-    st.divider()
-
-    # Herramientas de estudio
-    st.subheader("Herramientas de Estudio")
-    use_flashcards = st.checkbox("Generador de Flashcards", value=True)
-    use_exam = st.checkbox("Generador de Exámenes", value=True)
+    tool_toggles()
 
 # Interfaz principal de chat
 col1, col2 = st.columns([1, 4])
@@ -125,8 +244,26 @@ with col2:
     st.title("🧬 Rosalind")
     st.caption("Tu tutora de bioquímica personal • Creada con 💕 por Cosimo para Jimena")
 
-# Display chat history
-for message in st.session_state.messages:
+# Display chat history: ventana reciente en memoria, mensajes anteriores bajo demanda
+chat_store = get_chat_store()
+hidden_count = (
+    chat_store.count(st.session_state.session_id)
+    - len(st.session_state.messages)
+    - st.session_state.older_shown
+)
+if hidden_count > 0 and st.button(f"Mostrar mensajes anteriores ({hidden_count})"):
+    st.session_state.older_shown += HISTORY_WINDOW
+    st.rerun()
+
+older_messages = []
+if st.session_state.older_shown:
+    older_messages = chat_store.load(
+        st.session_state.session_id,
+        limit=st.session_state.older_shown,
+        offset=len(st.session_state.messages)
+    )
+
+for message in older_messages + st.session_state.messages:
     with st.chat_message(message["role"]):
         if message["role"] == "assistant":
             render_message_with_diagrams(message["content"])
@@ -136,91 +273,83 @@ for message in st.session_state.messages:
 # Entrada de chat
 if prompt := st.chat_input("¿En qué te ayudo, Jimena? 💬"):
     # Agregar mensaje del usuario
-    st.session_state.messages.append({"role": "user", "content": prompt})
+    add_message("user", prompt)
     with st.chat_message("user"):
         st.markdown(prompt)
 
     # Generar respuesta
     with st.chat_message("assistant"):
-        with st.spinner("Pensando..."):
-            from google.genai import types
-            from core.tools import (
-                calculate_ph, enzyme_kinetics, isoelectric_point,
-                create_flashcards, create_exam
-            )
-
-            # Construir lista de herramientas según toggles
-            tools = []
-            if use_ph_calc:
-                tools.append(calculate_ph)
-            if use_kinetics:
-                tools.append(enzyme_kinetics)
-            if use_pi_calc:
-                tools.append(isoelectric_point)
-            if use_flashcards:
-                tools.append(create_flashcards)
-            if use_exam:
-                tools.append(create_exam)
-
-            # Agregar herramienta RAG si está disponible
-            if st.session_state.rag_manager and st.session_state.rag_manager.store:
-                tools.append(st.session_state.rag_manager.get_file_search_tool())
-
-            # Prompt del sistema - Rosalind
-            system_instruction = """Eres Rosalind, tutora de bioquímica y buena amiga.
-Fuiste creada por Cosimo para ayudar a Jimena (el amor de su vida) a pasar su examen de bioquímica.
-
-## Tu personalidad:
-- Tono amigable pero enfocado: cercana sin ser demasiado informal
-- Puedes usar expresiones como "¡Muy bien!", "¡Exacto!", "Ojo con esto"
-- Eres directa y clara, siempre motivando a Jimena
-- Eres PROACTIVA: al final haces una pregunta de seguimiento o mini-reto
-  Ejemplo: "¿Te quedó claro? ¿Le damos otra vuelta? 🤔"
-- Si se equivoca, corriges con buena onda: "No exactamente, pero vas por buen camino. Mira:"
-- Cuando le atina: "¡Exacto, Jimena! 🎯" o "¡Muy bien!"
-
-## Tu estilo de enseñanza:
-- Explicaciones CLARAS y DIRECTAS - al punto
-- Usa analogías prácticas para conceptos difíciles
-- Marca lo que es "pregunta clásica de examen" o "esto es importante"
-- Si hay correlación clínica: '🏥 Relevancia clínica:'
-
-## Herramientas:
-- Para cálculos (pH, cinética, pI), USA las calculadoras proporcionadas
-- Para vías metabólicas o procesos, incluye diagramas Mermaid (```mermaid)
-- Cita fuentes con [Nombre de la Fuente] cuando uses los libros
-
-## Herramientas de estudio:
-- Para flashcards: Genera 5-10 tarjetas INMEDIATAMENTE sobre el tema del chat. NO preguntes cuántas.
-- Para exámenes: Genera 5-10 preguntas INMEDIATAMENTE sobre el tema del chat. NO preguntes cuántas.
-- Infiere el tema del contexto de la conversación
-- Si Jimena quiere más o menos preguntas, ella lo pedirá después
-- NUNCA hagas preguntas sobre cantidad o tema - solo genera el contenido
-- Basa las preguntas en el contenido de los documentos indexados
-- Los exámenes deben mezclar preguntas de opción múltiple y verdadero/falso
-
-## Tu misión:
-- Que Jimena APRUEBE su examen
-- Siempre en español
-- Directo al punto - ella necesita estudiar eficientemente
-- Termina con algo que la mantenga enganchada: pregunta, reto, dato interesante"""
-
-            # Generar respuesta
-            response = None
-            try:
-                response = st.session_state.client.models.generate_content(
-                    model="gemini-3-pro-preview",
-                    contents=prompt,
-                    config=types.GenerateContentConfig(
-                        system_instruction=system_instruction,
-                        tools=tools if tools else None
+        if is_small_talk(prompt):
+            # Saludos y agradecimientos: respuesta inmediata sin llamar a Gemini
+            assistant_message = random.choice(CANNED_REPLIES)
+            st.markdown(assistant_message)
+        else:
+            with st.spinner("Pensando..."):
+                # Herramientas habilitadas según toggles (y RAG si está disponible)
+                available_tools = {}
+                if st.session_state.use_ph_calc:
+                    available_tools["calculate_ph"] = calculate_ph
+                if st.session_state.use_kinetics:
+                    available_tools["enzyme_kinetics"] = enzyme_kinetics
+                if st.session_state.use_pi_calc:
+                    available_tools["isoelectric_point"] = isoelectric_point
+                if st.session_state.use_flashcards:
+                    available_tools["create_flashcards"] = create_flashcards
+                if st.session_state.use_exam:
+                    available_tools["create_exam"] = create_exam
+                if store_loaded:
+                    available_tools["file_search"] = rag_manager.get_file_search_tool()
+
+                # Adjuntar solo las herramientas relevantes para la pregunta
+                tools = select_tools(prompt, available_tools)
+                store_name = None
+                if "file_search" in available_tools and available_tools["file_search"] in tools:
+                    store_name = rag_manager.store_name
+
+                # Reutilizar la respuesta si la misma pregunta (o una parecida) ya fue contestada
+                response_cache = get_response_cache()
+                semantic_cache = get_semantic_cache(client)
+                tool_names = [tool.__name__ for tool in tools if callable(tool)]
+                cache_key = make_key(prompt, MODEL_NAME, SYSTEM_INSTRUCTION, tool_names, store_name)
+                cache_scope = make_key("", MODEL_NAME, SYSTEM_INSTRUCTION, tool_names, store_name)
+
+                # Generar respuesta
+                response = None
+                prompt_vector = None
+                # Flashcards y exámenes: siempre un set nuevo, nunca desde la caché
+                reuse_answer = not generates_study_set(tool_names)
+                assistant_message = response_cache.get(cache_key) if reuse_answer else None
+                if assistant_message is None and is_semantically_cacheable(prompt, tool_names):
+                    # Embeber cuesta una llamada extra antes de empezar a transmitir
+                    prompt_vector = semantic_cache.embed(prompt)
+                    if prompt_vector is not None:
+                        assistant_message = semantic_cache.lookup(prompt_vector, cache_scope)
+                        if assistant_message is not None:
+                            response_cache.set(cache_key, assistant_message)
+
+            # Mostrar la respuesta guardada o transmitirla a medida que se genera
+            if assistant_message is not None:
+                render_message_with_diagrams(assistant_message)
+            else:
+                placeholder = st.empty()
+                try:
+                    stream = client.models.generate_content_stream(
+                        model=MODEL_NAME,
+                        contents=prompt,
+                        config=build_config(SYSTEM_INSTRUCTION, tuple(tool_names), store_name)
                     )
-                )
-                assistant_message = response.text if response.text else "No pude generar una respuesta."
-            except Exception as e:
-                assistant_message = f"Error: {e}"
-
-            render_message_with_diagrams(assistant_message)
+                    assistant_message, response = stream_response(stream, placeholder)
+                    if assistant_message:
+                        if reuse_answer:
+                            response_cache.set(cache_key, assistant_message)
+                        if prompt_vector is not None:
+                            semantic_cache.add(prompt_vector, cache_scope, assistant_message)
+                    else:
+                        assistant_message = "No pude generar una respuesta."
+                        placeholder.markdown(assistant_message)
+                except Exception as e:
+                    assistant_message = f"Error: {e}"
+                    placeholder.markdown(assistant_message)
 
             # Mostrar citas si están disponibles
             if response and hasattr(response, 'grounding_metadata') and response.grounding_metadata:
@@ -228,4 +357,4 @@ Fuiste creada por Cosimo para ayudar a Jimena (el amor de su vida) a pasar su ex
                     for source in response.grounding_metadata.get('sources', []):
                         st.write(f"- {source}")
 
-    st.session_state.messages.append({"role": "assistant", "content": assistant_message})
+    add_message("assistant", assistant_message)
@@ -0,0 +1,109 @@
+# core/chat_store.py
+"""SQLite-backed chat history."""
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional
+
+# Default path for the chat history database
+DEFAULT_DB_PATH = Path(".streamlit/chat_history.db")
+
+
+class ChatStore:
+    """
+    Persists chat messages per session in SQLite.
+
+    Lets the app keep only a recent window of messages in memory and
+    page older ones from disk on demand. Safe to share across threads.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        """
+        Open (or create) the chat history database.
+
+        Args:
+            db_path: Path to the SQLite file (default: .streamlit/chat_history.db)
+        """
+        self.db_path = db_path or DEFAULT_DB_PATH
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS messages ("
+                " session_id TEXT NOT NULL,"
+                " idx INTEGER NOT NULL,"
+                " role TEXT NOT NULL,"
+                " content TEXT NOT NULL,"
+                " PRIMARY KEY (session_id, idx))"
+            )
+            self._conn.commit()
+
+    def append(self, session_id: str, role: str, content: str) -> int:
+        """
+        Append a message to a session's history.
+
+        Args:
+            session_id: Identifier of the chat session.
+            role: "user" or "assistant".
+            content: Message text.
+
+        Returns:
+            Position of the message within the session (starting at 0).
+        """
+        with self._lock:
+            (idx,) = self._conn.execute(
+                "SELECT COALESCE(MAX(idx) + 1, 0) FROM messages WHERE session_id = ?",
+                (session_id,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT INTO messages (session_id, idx, role, content) VALUES (?, ?, ?, ?)",
+                (session_id, idx, role, content)
+            )
+            self._conn.commit()
+        return idx
+
+    def count(self, session_id: str) -> int:
+        """
+        Count the messages stored for a session.
+
+        Args:
+            session_id: Identifier of the chat session.
+
+        Returns:
+            Number of stored messages.
+        """
+        with self._lock:
+            (count,) = self._conn.execute(
+                "SELECT COUNT(*) FROM messages WHERE session_id = ?",
+                (session_id,)
+            ).fetchone()
+        return count
+
+    def load(self, session_id: str, limit: int, offset: int = 0) -> list[dict]:
+        """
+        Load a page of messages, counting back from the newest.
+
+        Args:
+            session_id: Identifier of the chat session.
+            limit: Maximum number of messages to return.
+            offset: Number of newest messages to skip.
+
+        Returns:
+            Messages as {"role", "content"} dicts in chronological order.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT role, content FROM messages WHERE session_id = ?"
+                " ORDER BY idx DESC LIMIT ? OFFSET ?",
+                (session_id, limit, offset)
+            ).fetchall()
+        return [{"role": role, "content": content} for role, content in reversed(rows)]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -1,13 +1,19 @@
 # core/client.py
 """Gemini client initialization."""
 import os
+import threading
+from functools import lru_cache
 from google import genai
 
 
+@lru_cache(maxsize=1)
 def get_client() -> genai.Client:
     """
     Create and return a configured Gemini client.
 
+    The client is built once per process and reused on later calls;
+    call get_client.cache_clear() after changing GOOGLE_API_KEY.
+
     Returns:
         genai.Client: Configured Gemini client instance.
 
@@ -19,3 +25,28 @@ def get_client() -> genai.Client:
         raise ValueError("GOOGLE_API_KEY environment variable is required")
 
     return genai.Client(api_key=api_key)
+
+
+def warm_up(client: genai.Client) -> threading.Thread:
+    """
+    Open the connection to the Gemini API in a background thread.
+
+    Issues a cheap models.list() request so DNS, TLS and HTTP/2 setup
+    happen before the first chat prompt instead of during it. Errors
+    are ignored; the first real request will surface them.
+
+    Args:
+        client: Configured Gemini client instance.
+
+    Returns:
+        The started daemon thread.
+    """
+    def _warm():
+        try:
+            next(iter(client.models.list()), None)
+        except Exception:
+            pass
+
+    thread = threading.Thread(target=_warm, daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,77 @@
+# core/query_validator.py
+"""Cheap prompt checks to skip unnecessary Gemini work."""
+import re
+
+# Greetings, thanks and farewells: a prompt needs one of these (or a laugh)
+# to count as small talk
+SMALL_TALK_WORDS = frozenset({
+    "hola", "holi", "buenas", "buenos", "dias", "días", "tardes", "noches",
+    "gracias", "chao", "adios", "adiós", "bye",
+})
+
+# Words that may accompany small talk but don't make a prompt small talk on
+# their own ("ok" or "ya" can preface a follow-up; "no entiendo" must reach
+# the model, so neither "no" nor "entiendo" is listed)
+FILLER_WORDS = frozenset({
+    "muchas", "mil", "ok", "okay", "oki", "vale", "dale", "listo", "si", "sí",
+    "claro", "ya", "bien", "genial", "perfecto", "super", "súper", "muy",
+})
+
+# Minimum words for a prompt to be worth a document search
+MIN_RETRIEVAL_WORDS = 3
+
+# Replies for prompts that don't need the model
+CANNED_REPLIES = (
+    "¡Aquí estoy, Jimena! 😊 ¿Qué tema de bioquímica repasamos ahora?",
+    "¡Con gusto! ¿Seguimos con otro tema o te preparo unas flashcards? 📚",
+    "¡Muy bien! Cuando quieras, pregúntame lo que sea del temario. 🧬",
+    "¡Vamos con todo! ¿Te hago un mini-examen para practicar? 📝",
+)
+
+_WORD_RE = re.compile(r"\w+")
+_LAUGH_RE = re.compile(r"^(?:ja|je|ji|ha)+$")
+
+
+def _is_social(word: str) -> bool:
+    """Whether a lowercase word is a greeting, thanks, farewell or laugh."""
+    return word in SMALL_TALK_WORDS or _LAUGH_RE.match(word) is not None
+
+
+def is_small_talk(prompt: str) -> bool:
+    """
+    Check whether a prompt is conversational filler.
+
+    A prompt is filler when it contains a greeting, thanks, farewell or
+    laugh and every other word is an acknowledgement. Acknowledgements
+    alone ("ok", "sí") and confusion ("no entiendo") go to the model.
+
+    Args:
+        prompt: The user's chat message.
+
+    Returns:
+        True if the prompt can be answered with a canned reply.
+
+    Example:
+        >>> is_small_talk("¡Gracias!")
+        True
+        >>> is_small_talk("¿Qué es la glucólisis?")
+        False
+    """
+    words = _WORD_RE.findall(prompt.lower())
+    if not any(_is_social(word) for word in words):
+        return False
+    return all(word in FILLER_WORDS or _is_social(word) for word in words)
+
+
+def needs_retrieval(prompt: str) -> bool:
+    """
+    Check whether a prompt is substantive enough to search the documents.
+
+    Args:
+        prompt: The user's chat message.
+
+    Returns:
+        True if the file search tool should be attached.
+    """
+    words = _WORD_RE.findall(prompt)
+    return len(words) >= MIN_RETRIEVAL_WORDS and not is_small_talk(prompt)
@@ -1,17 +1,100 @@
 # core/rag_manager.py
 """RAG Manager for Gemini File Search stores."""
+import asyncio
 import json
 import os
+import random
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Optional
 
 from google import genai
 from google.genai import types
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib json module is used instead
+    orjson = None
+
 # Default path for storing RAG configuration
 DEFAULT_CONFIG_PATH = Path(".streamlit/rag_store.json")
 
+# Polling schedule for upload operations (seconds); small files finish
+# within the first polls, so start fast
+POLL_INITIAL_DELAY = 0.5
+POLL_BACKOFF_FACTOR = 1.8
+POLL_MAX_DELAY = 10.0
+# Up to this fraction is added to each delay so concurrent pollers drift apart
+POLL_JITTER = 0.1
+
+# Maximum uploads running in the background at once
+UPLOAD_WORKERS = 4
+
+# Maximum uploads in flight at once for aupload_files()
+ASYNC_UPLOAD_CONCURRENCY = 8
+
+# Longest the shared background poller sleeps, so a newly registered
+# upload is picked up promptly; waking up makes no status request
+POLL_BUS_INTERVAL = 0.5
+
+# Seconds a document count is reused before listing the store again
+DOC_COUNT_TTL = 30
+
+# HTTP status codes that mean the API is throttling us
+THROTTLE_CODES = frozenset({429, 503})
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize to JSON bytes, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def _loads(data: bytes) -> Any:
+    """Parse JSON bytes, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _poll_delays():
+    """
+    Yield sleep times for polling an operation.
+
+    Delays grow by POLL_BACKOFF_FACTOR from POLL_INITIAL_DELAY, get up to
+    POLL_JITTER extra, and never exceed POLL_MAX_DELAY. The jitter is
+    smaller than the growth factor, so the sequence never decreases.
+    """
+    delay = POLL_INITIAL_DELAY
+    while True:
+        yield min(delay * (1 + random.uniform(0, POLL_JITTER)), POLL_MAX_DELAY)
+        delay = min(delay * POLL_BACKOFF_FACTOR, POLL_MAX_DELAY)
+
+
+def is_throttled(error: Exception) -> bool:
+    """Whether an API error is a rate-limit (429) or overload (503) response."""
+    return getattr(error, "code", None) in THROTTLE_CODES
+
+
+class _PendingOperation:
+    """An in-flight upload operation tracked by the shared poller, with its own backoff."""
+
+    __slots__ = ("operation", "error", "finished", "delays", "next_poll")
+
+    def __init__(self, operation: Any):
+        self.operation = operation
+        self.error: Optional[Exception] = None
+        self.finished = threading.Event()
+        self.delays = _poll_delays()
+        self.next_poll = time.monotonic() + next(self.delays)
+
+    def schedule_next_poll(self, now: float) -> None:
+        """Push the next poll back by the following backoff delay."""
+        self.next_poll = now + next(self.delays)
+
 
 class RAGManager:
     """
@@ -34,6 +117,13 @@ class RAGManager:
         self.store = None
         self.store_name: Optional[str] = None
         self.config_path = config_path or DEFAULT_CONFIG_PATH
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._cached_tool: Optional[types.Tool] = None
+        self._saved_store_name: Optional[str] = None
+        self._doc_count_cache: tuple[float, int] = (0.0, 0)
+        self._poll_bus: dict[str, _PendingOperation] = {}
+        self._poll_lock = threading.Lock()
+        self._poller: Optional[threading.Thread] = None
 
     def load_existing_store(self, store_name_override: Optional[str] = None) -> bool:
         """
@@ -51,9 +141,9 @@ class RAGManager:
         # If no override, try to load from config file
         if not store_name and self.config_path.exists():
             try:
-                with open(self.config_path) as f:
-                    config = json.load(f)
+                config = _loads(self.config_path.read_bytes())
                 store_name = config.get("store_name")
+                self._saved_store_name = store_name
             except Exception:
                 pass
 
@@ -64,16 +154,23 @@ class RAGManager:
             # Verify the store still exists on Gemini
             self.store = self.client.file_search_stores.get(name=store_name)
             self.store_name = store_name
+            self._cached_tool = None
+            self._doc_count_cache = (0.0, 0)
             return True
         except Exception:
             # Store doesn't exist anymore or config is invalid
             return False
 
     def _save_config(self):
-        """Save store configuration to disk."""
+        """Save store configuration to disk atomically, skipping unchanged writes."""
+        if self.store_name == self._saved_store_name:
+            return
+
         self.config_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.config_path, "w") as f:
-            json.dump({"store_name": self.store_name}, f)
+        tmp_path = self.config_path.with_suffix(".tmp")
+        tmp_path.write_bytes(_dumps({"store_name": self.store_name}))
+        os.replace(tmp_path, self.config_path)
+        self._saved_store_name = self.store_name
 
     def create_store(self, display_name: str) -> Any:
         """
@@ -89,10 +186,14 @@ class RAGManager:
             config={"display_name": display_name}
         )
         self.store_name = self.store.name
+        self._cached_tool = None
+        self._doc_count_cache = (0.0, 0)
         self._save_config()
         return self.store
 
-    def upload_file(self, file_path: str, display_name: str, timeout: int = 300) -> bool:
+    def upload_file(
+        self, file_path: str, display_name: str, timeout: int = 300, shared_poll: bool = False
+    ) -> bool:
         """
         Upload a file to the current file search store.
 
@@ -100,6 +201,9 @@ class RAGManager:
             file_path: Path to the file to upload (PDF, TXT, MD, etc.).
             display_name: Human-readable name for the file in the store.
             timeout: Maximum seconds to wait for upload completion.
+            shared_poll: Wait on the manager's single poller thread instead
+                of a backoff loop of its own. Use this when several threads
+                upload at once.
 
         Returns:
             True if upload completed successfully.
@@ -108,30 +212,304 @@ class RAGManager:
             ValueError: If no store has been created yet.
             TimeoutError: If upload does not complete within timeout.
         """
+        if shared_poll:
+            return self._upload_file_shared_poll(file_path, display_name, timeout)
+
+        operation = self._start_upload(file_path, display_name)
+        operation, = self._poll_until_done([operation], timeout)
+
+        if not operation.done:
+            raise TimeoutError(f"File upload did not complete within {timeout} seconds")
+
+        self._doc_count_cache = (0.0, 0)
+        return True
+
+    def upload_files(self, items: list[tuple[str, str]], batch_size: int = 32, timeout: int = 300) -> bool:
+        """
+        Upload several files, polling each batch in a single loop.
+
+        Up to batch_size uploads are started before any polling, so the
+        server processes them together and the backoff sleeps are paid
+        once per batch instead of once per file.
+
+        Args:
+            items: (file_path, display_name) pairs to upload.
+            batch_size: Uploads started before waiting for them to finish.
+            timeout: Maximum seconds to wait for each batch to complete.
+
+        Returns:
+            True if every upload completed successfully.
+
+        Raises:
+            ValueError: If no store has been created yet.
+            TimeoutError: If a batch does not complete within timeout.
+        """
+        for start in range(0, len(items), batch_size):
+            batch = items[start:start + batch_size]
+            operations = [
+                self._start_upload(file_path, display_name)
+                for file_path, display_name in batch
+            ]
+            operations = self._poll_until_done(operations, timeout)
+            self._doc_count_cache = (0.0, 0)
+
+            pending = [display_name for (_, display_name), op in zip(batch, operations) if not op.done]
+            if pending:
+                raise TimeoutError(
+                    f"File uploads did not complete within {timeout} seconds: {', '.join(pending)}"
+                )
+
+        return True
+
+    async def aupload_files(
+        self,
+        items: list[tuple[str, str]],
+        concurrency: int = ASYNC_UPLOAD_CONCURRENCY,
+        timeout: int = 300,
+    ) -> list[bool]:
+        """
+        Upload several files concurrently from an asyncio event loop.
+
+        Uses the SDK's native async client (client.aio), so waiting on
+        uploads never blocks the loop or ties up threads. A semaphore
+        keeps at most `concurrency` uploads in flight.
+
+        Args:
+            items: (file_path, display_name) pairs to upload.
+            concurrency: Maximum uploads started or polling at once.
+            timeout: Maximum seconds to wait for each upload to complete.
+
+        Returns:
+            True for each item, in the same order as items.
+
+        Raises:
+            ValueError: If no store has been created yet.
+            TimeoutError: If an upload does not complete within timeout.
+        """
         if self.store is None:
             raise ValueError("A file search store must be created first")
 
-        operation = self.client.file_search_stores.upload_to_file_search_store(
+        semaphore = asyncio.Semaphore(concurrency)
+        try:
+            results = await asyncio.gather(*(
+                self._aupload_one(semaphore, file_path, display_name, timeout)
+                for file_path, display_name in items
+            ))
+        finally:
+            self._doc_count_cache = (0.0, 0)
+        return list(results)
+
+    async def _aupload_one(
+        self, semaphore: asyncio.Semaphore, file_path: str, display_name: str, timeout: float
+    ) -> bool:
+        """Upload one file and poll it with asyncio.sleep-based backoff."""
+        async with semaphore:
+            operation = await self.client.aio.file_search_stores.upload_to_file_search_store(
+                file=file_path,
+                file_search_store_name=self.store.name,
+                config={"display_name": display_name}
+            )
+
+            deadline = time.monotonic() + timeout
+            delays = _poll_delays()
+            while not operation.done and time.monotonic() < deadline:
+                await asyncio.sleep(next(delays))
+                try:
+                    operation = await self.client.aio.operations.get(operation)
+                except Exception as e:
+                    # The upload was already accepted; check again after the next delay
+                    if not is_throttled(e):
+                        raise
+
+        if not operation.done:
+            raise TimeoutError(f"File upload did not complete within {timeout} seconds")
+        return True
+
+    def _poll_until_done(self, operations: list, timeout: float) -> list:
+        """
+        Poll operations with exponential backoff until all are done or time runs out.
+
+        Only operations that are still pending are refreshed on each round.
+
+        Args:
+            operations: Operations returned by upload_to_file_search_store.
+            timeout: Maximum seconds to keep polling.
+
+        Returns:
+            The latest version of each operation, in the same order.
+        """
+        operations = list(operations)
+        pending = [i for i, operation in enumerate(operations) if not operation.done]
+
+        # Checked against the clock, not a count of sleeps, so slow
+        # status requests still count towards the timeout.
+        deadline = time.monotonic() + timeout
+        delays = _poll_delays()
+        while pending and time.monotonic() < deadline:
+            time.sleep(next(delays))
+            for i in pending:
+                operations[i] = self._refresh_operation(operations[i])
+            pending = [i for i in pending if not operations[i].done]
+
+        return operations
+
+    def _refresh_operation(self, operation: Any) -> Any:
+        """
+        Fetch the latest status of an upload operation.
+
+        The upload itself was already accepted, so a throttled status
+        check is not a failure: the last known operation is returned and
+        the caller polls again after its next backoff delay.
+
+        Raises:
+            Exception: Whatever operations.get raised, unless it was throttling.
+        """
+        try:
+            return self.client.operations.get(operation)
+        except Exception as e:
+            if is_throttled(e):
+                return operation
+            raise
+
+    def _start_upload(self, file_path: str, display_name: str) -> Any:
+        """Start an upload and return its long-running operation."""
+        if self.store is None:
+            raise ValueError("A file search store must be created first")
+
+        return self.client.file_search_stores.upload_to_file_search_store(
             file=file_path,
             file_search_store_name=self.store.name,
             config={"display_name": display_name}
         )
 
-        elapsed = 0
-        while not operation.done and elapsed < timeout:
-            time.sleep(5)
-            elapsed += 5
-            operation = self.client.operations.get(operation)
+    def _upload_file_shared_poll(self, file_path: str, display_name: str, timeout: int) -> bool:
+        """Upload a file, waiting on the shared poller instead of polling alone."""
+        operation = self._start_upload(file_path, display_name)
+
+        if not operation.done:
+            operation = self._wait_for_operation(operation, timeout)
 
         if not operation.done:
             raise TimeoutError(f"File upload did not complete within {timeout} seconds")
 
+        self._doc_count_cache = (0.0, 0)
         return True
 
+    def _wait_for_operation(self, operation: Any, timeout: float) -> Any:
+        """
+        Register an operation with the shared poller and block until it settles.
+
+        Args:
+            operation: Operation returned by upload_to_file_search_store.
+            timeout: Maximum seconds to wait.
+
+        Returns:
+            The latest operation seen by the poller (check .done for timeouts).
+
+        Raises:
+            Exception: Whatever operations.get raised while polling this operation.
+        """
+        pending = _PendingOperation(operation)
+        with self._poll_lock:
+            self._poll_bus[operation.name] = pending
+            if self._poller is None:
+                self._poller = threading.Thread(target=self._poll_loop, daemon=True)
+                self._poller.start()
+
+        pending.finished.wait(timeout)
+
+        with self._poll_lock:
+            self._poll_bus.pop(operation.name, None)
+
+        if pending.error is not None:
+            raise pending.error
+        return pending.operation
+
+    def _poll_loop(self) -> None:
+        """
+        Refresh each registered operation on its own backoff schedule.
+
+        A single thread polls for all in-flight uploads. Every operation
+        keeps the same capped backoff as a lone upload_file() call, and
+        the thread sleeps until the earliest poll is due (at most
+        POLL_BUS_INTERVAL, to notice new registrations), so sharing the
+        poller never costs extra status requests. The thread exits once
+        no operations are pending and is restarted by the next
+        registration.
+        """
+        while True:
+            with self._poll_lock:
+                if not self._poll_bus:
+                    self._poller = None
+                    return
+                pending_ops = [p for p in self._poll_bus.values() if not p.finished.is_set()]
+
+            now = time.monotonic()
+            due = [pending for pending in pending_ops if pending.next_poll <= now]
+            if not due:
+                earliest = min((pending.next_poll for pending in pending_ops), default=now)
+                time.sleep(min(max(earliest - now, 0.0), POLL_BUS_INTERVAL))
+                continue
+
+            for pending in due:
+                try:
+                    pending.operation = self._refresh_operation(pending.operation)
+                except Exception as e:
+                    pending.error = e
+                    pending.finished.set()
+                    continue
+                if pending.operation.done:
+                    pending.finished.set()
+                else:
+                    pending.schedule_next_poll(time.monotonic())
+
+    def upload_file_async(self, file_path: str, display_name: str, timeout: int = 300) -> Future:
+        """
+        Upload a file in a background thread.
+
+        While it is processing, the operation is polled by a single
+        shared thread together with every other background upload.
+
+        Args:
+            file_path: Path to the file to upload (PDF, TXT, MD, etc.).
+            display_name: Human-readable name for the file in the store.
+            timeout: Maximum seconds to wait for upload completion.
+
+        Returns:
+            Future resolving to True, or raising the errors of upload_file().
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=UPLOAD_WORKERS)
+
+        return self._executor.submit(
+            self.upload_file, file_path, display_name, timeout, shared_poll=True
+        )
+
+    def upload_files_async(self, items: list[tuple[str, str]], timeout: int = 300) -> list[Future]:
+        """
+        Upload several files concurrently in background threads.
+
+        At most UPLOAD_WORKERS uploads run at once to stay clear of API
+        rate limits; the rest wait in the pool's queue.
+
+        Args:
+            items: (file_path, display_name) pairs to upload.
+            timeout: Maximum seconds to wait for each upload to complete.
+
+        Returns:
+            One Future per item, in the same order as items.
+        """
+        return [
+            self.upload_file_async(file_path, display_name, timeout)
+            for file_path, display_name in items
+        ]
+
     def get_file_search_tool(self) -> types.Tool:
         """
         Get the File Search tool configuration for generate_content.
 
+        The tool is built once per store and reused on later calls.
+
         Returns:
             types.Tool configured with the current file search store.
 
@@ -141,27 +519,39 @@ class RAGManager:
         if self.store is None:
             raise ValueError("A file search store must be created first")
 
-        return types.Tool(
-            file_search=types.FileSearch(
-                file_search_store_names=[self.store.name]
+        if self._cached_tool is None:
+            self._cached_tool = types.Tool(
+                file_search=types.FileSearch(
+                    file_search_store_names=[self.store.name]
+                )
             )
-        )
+        return self._cached_tool
 
     def get_document_count(self) -> int:
         """
         Get the number of documents in the current store.
 
+        The count is cached for DOC_COUNT_TTL seconds, since the sidebar
+        asks for it on every Streamlit rerun.
+
         Returns:
             Number of documents, or 0 if no store is loaded.
         """
         if self.store is None or self.store_name is None:
             return 0
 
+        now = time.monotonic()
+        fetched_at, count = self._doc_count_cache
+        if fetched_at and now - fetched_at < DOC_COUNT_TTL:
+            return count
+
         try:
             # List files in the store to count them
-            files = list(self.client.file_search_stores.files.list(
+            count = sum(1 for _ in self.client.file_search_stores.files.list(
                 file_search_store_name=self.store_name
             ))
-            return len(files)
         except Exception:
             return 0
+
+        self._doc_count_cache = (now, count)
+        return count
@@ -0,0 +1,114 @@
+# core/response_cache.py
+"""Exact-match cache for generated tutor responses."""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+# Default cache limits
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_TTL_SECONDS = 3600
+
+
+def _key(*parts: str) -> bytes:
+    """Hash parts into a 128-bit key; separators keep ("ab", "c") != ("a", "bc")."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\x00")
+    return h.digest()
+
+
+def make_key(
+    prompt: str,
+    model: str,
+    system_instruction: str,
+    tool_names: Iterable[str],
+    store_name: Optional[str] = None,
+) -> bytes:
+    """
+    Build a cache key for a generate_content request.
+
+    Tool names are sorted so the key does not depend on the order in
+    which tools were enabled.
+
+    Args:
+        prompt: The user prompt sent to the model.
+        model: Model name used for generation.
+        system_instruction: System prompt used for generation.
+        tool_names: Names of the tools attached to the request.
+        store_name: File search store attached to the request, if any.
+
+    Returns:
+        16-byte BLAKE2b digest identifying the request.
+    """
+    return _key(prompt, model, system_instruction, *sorted(tool_names), store_name or "")
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache of response texts with a time-to-live.
+
+    Shared by every Streamlit session, so a question that was already
+    answered skips the Gemini round-trip entirely.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: float = DEFAULT_TTL_SECONDS):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries: Maximum number of responses kept before evicting the oldest.
+            ttl: Seconds a cached response stays valid.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[bytes, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: bytes) -> Optional[str]:
+        """
+        Return the cached response for a key.
+
+        Args:
+            key: Key built with make_key().
+
+        Returns:
+            The cached response text, or None if missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, text = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return text
+
+    def set(self, key: bytes, text: str) -> None:
+        """
+        Store a response, evicting the least recently used entry if full.
+
+        Args:
+            key: Key built with make_key().
+            text: Response text to cache.
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, text)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
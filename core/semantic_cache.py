@@ -0,0 +1,181 @@
+# core/semantic_cache.py
+"""Semantic cache that reuses answers for paraphrased questions."""
+import re
+import threading
+from typing import Optional, Sequence
+
+import numpy as np
+from google import genai
+
+# Default embedding model and cache limits
+DEFAULT_EMBEDDING_MODEL = "gemini-embedding-001"
+DEFAULT_DIMENSIONS = 768
+DEFAULT_THRESHOLD = 0.95
+DEFAULT_MAX_ENTRIES = 2048
+
+# Prompts with numbers (concentrations, pKa values) embed almost identically
+# whatever the numbers are, so they are never matched semantically
+_DIGIT_RE = re.compile(r"\d")
+
+# Tools whose output should be a new set every time it is requested
+STUDY_SET_TOOLS = frozenset({"create_flashcards", "create_exam"})
+
+
+def generates_study_set(tool_names: Sequence[str]) -> bool:
+    """
+    Check whether a request may produce flashcards or an exam.
+
+    Asking again for "otro examen" should give new practice material, so
+    answers to these requests are neither reused nor stored, by this
+    cache or by the exact-match response cache.
+
+    Args:
+        tool_names: Names of the function tools attached to the request.
+
+    Returns:
+        True if a study-set tool is attached.
+    """
+    return not STUDY_SET_TOOLS.isdisjoint(tool_names)
+
+
+def is_semantically_cacheable(prompt: str, tool_names: Sequence[str]) -> bool:
+    """
+    Check whether a prompt may reuse the answer of a paraphrased prompt.
+
+    Calculator results depend on the numbers in the prompt, and flashcards
+    or exams should be a new set each time, but such prompts easily clear
+    the similarity threshold. They skip the semantic tier, and with it the
+    embedding call that would otherwise delay streaming by one round trip.
+    The exact-match cache still applies to them.
+
+    Args:
+        prompt: The user's chat message.
+        tool_names: Names of the function tools attached to the request.
+
+    Returns:
+        True if the semantic cache should be consulted and filled.
+    """
+    return not tool_names and _DIGIT_RE.search(prompt) is None
+
+
+class _ScopeEntries:
+    """Fixed-size ring buffer of prompt vectors and their answers."""
+
+    def __init__(self, dimensions: int, capacity: int):
+        self.vectors = np.zeros((capacity, dimensions), dtype=np.float32)
+        self.answers: list[str] = []
+        self.next_index = 0
+
+    def add(self, vector: np.ndarray, answer: str) -> None:
+        capacity = len(self.vectors)
+        self.vectors[self.next_index] = vector
+        if len(self.answers) < capacity:
+            self.answers.append(answer)
+        else:
+            self.answers[self.next_index] = answer
+        self.next_index = (self.next_index + 1) % capacity
+
+    def best_match(self, vector: np.ndarray) -> tuple[float, int]:
+        similarities = self.vectors[:len(self.answers)] @ vector
+        best = int(np.argmax(similarities))
+        return float(similarities[best]), best
+
+
+class SemanticCache:
+    """
+    Cache of answers keyed by prompt embeddings.
+
+    Prompts are embedded with Gemini and compared by cosine similarity
+    against previously answered prompts. Entries are grouped by scope
+    (model, system prompt, tools and store) so an answer is only reused
+    under the same generation settings.
+    """
+
+    def __init__(
+        self,
+        client: genai.Client,
+        model: str = DEFAULT_EMBEDDING_MODEL,
+        threshold: float = DEFAULT_THRESHOLD,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        """
+        Initialize an empty semantic cache.
+
+        Args:
+            client: Configured Gemini client instance.
+            model: Embedding model used for prompts.
+            threshold: Minimum cosine similarity to count as a hit.
+            max_entries: Maximum entries per scope before evicting the oldest.
+        """
+        self.client = client
+        self.model = model
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._scopes: dict[bytes, _ScopeEntries] = {}
+        self._lock = threading.Lock()
+
+    def embed(self, text: str) -> Optional[np.ndarray]:
+        """
+        Embed a prompt as an L2-normalized vector.
+
+        Args:
+            text: Prompt to embed.
+
+        Returns:
+            float32 unit vector, or None if the embedding call failed.
+        """
+        try:
+            result = self.client.models.embed_content(
+                model=self.model,
+                contents=text,
+                config={"output_dimensionality": DEFAULT_DIMENSIONS}
+            )
+            vector = np.asarray(result.embeddings[0].values, dtype=np.float32)
+        except Exception:
+            return None
+
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return None
+        return vector / norm
+
+    def lookup(self, vector: np.ndarray, scope: bytes) -> Optional[str]:
+        """
+        Find the answer of the most similar cached prompt.
+
+        Args:
+            vector: Unit vector returned by embed().
+            scope: Identifier of the generation settings.
+
+        Returns:
+            The cached answer if its similarity reaches the threshold, otherwise None.
+        """
+        with self._lock:
+            entries = self._scopes.get(scope)
+            if entries is None:
+                return None
+
+            similarity, index = entries.best_match(vector)
+            if similarity < self.threshold:
+                return None
+            return entries.answers[index]
+
+    def add(self, vector: np.ndarray, scope: bytes, answer: str) -> None:
+        """
+        Store an answer for a prompt embedding, evicting the oldest if full.
+
+        Args:
+            vector: Unit vector returned by embed().
+            scope: Identifier of the generation settings.
+            answer: Response text to reuse for similar prompts.
+        """
+        with self._lock:
+            entries = self._scopes.get(scope)
+            if entries is None:
+                entries = _ScopeEntries(len(vector), self.max_entries)
+                self._scopes[scope] = entries
+            entries.add(vector, answer)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(entries.answers) for entries in self._scopes.values())
@@ -0,0 +1,55 @@
+# core/tool_configs.py
+"""Prebuilt generate_content configs, shared across chat turns."""
+from functools import lru_cache
+from typing import Optional
+
+from google.genai import types
+
+from core.prompts import PROMPTS
+from core.tools import (
+    calculate_ph, enzyme_kinetics, isoelectric_point,
+    create_flashcards, create_exam
+)
+
+# Every function tool Gemini can call, in attachment order
+TOOLS_ALL = (calculate_ph, enzyme_kinetics, isoelectric_point, create_flashcards, create_exam)
+TOOLS_BY_NAME = {tool.__name__: tool for tool in TOOLS_ALL}
+
+
+@lru_cache(maxsize=256)
+def build_config(
+    system_instruction: str,
+    tool_names: tuple[str, ...] = (),
+    store_name: Optional[str] = None,
+) -> types.GenerateContentConfig:
+    """
+    Return the generate_content config for a system prompt and tool set.
+
+    Configs are validated once per distinct combination and then shared,
+    so callers must treat the returned object as read-only.
+
+    Args:
+        system_instruction: System prompt for the model (empty for none).
+        tool_names: Names of the function tools to attach (see TOOLS_BY_NAME).
+        store_name: File search store to attach, if any.
+
+    Returns:
+        The cached types.GenerateContentConfig.
+
+    Raises:
+        KeyError: If a tool name is unknown.
+    """
+    tools: list = [TOOLS_BY_NAME[name] for name in tool_names]
+    if store_name:
+        tools.append(types.Tool(
+            file_search=types.FileSearch(file_search_store_names=[store_name])
+        ))
+
+    return types.GenerateContentConfig(
+        system_instruction=system_instruction or None,
+        tools=tools or None
+    )
+
+
+# Rosalind with every function tool attached
+DEFAULT_CONFIG = build_config(PROMPTS["rosalind"], tuple(TOOLS_BY_NAME))
@@ -0,0 +1,56 @@
+# core/tool_router.py
+"""Selects which tools to attach to a prompt."""
+import re
+from typing import Any
+
+from core.query_validator import needs_retrieval
+
+# Tool names in the order they are attached to the request
+TOOL_ORDER = (
+    "calculate_ph",
+    "enzyme_kinetics",
+    "isoelectric_point",
+    "create_flashcards",
+    "create_exam",
+    "file_search",
+)
+
+_CALCULATORS = ("calculate_ph", "enzyme_kinetics", "isoelectric_point")
+_STUDY_TOOLS = ("create_flashcards", "create_exam")
+
+_TOOL_PATTERNS = (
+    ("calculate_ph", re.compile(r"\b(pH|p\.H|pKa|hidrogeniones|acidez|buffer|amortiguador\w*|tamp[oó]n|Henderson)\b", re.I)),
+    ("enzyme_kinetics", re.compile(r"\b(Km|Vmax|Michaelis|Menten|cin[eé]tica|enzim\w*|sustrato)\b", re.I)),
+    ("isoelectric_point", re.compile(r"\b(pI|pKa|punto\s+isoel[eé]ctrico|isoel[eé]ctrico)\b", re.I)),
+    ("create_flashcards", re.compile(r"\b(flash\s*cards?|tarjetas?)\b", re.I)),
+    ("create_exam", re.compile(r"\b(ex[aá]men(es)?|quiz|test|prueba|preguntas)\b", re.I)),
+)
+_CALCULATE = re.compile(r"\bcalcul\w*", re.I)
+
+
+def select_tools(prompt: str, available: dict[str, Any]) -> list:
+    """
+    Pick the tools relevant to a prompt.
+
+    Calculators are attached only when the prompt mentions their topic
+    (or asks to calculate something), study tools when it asks for
+    flashcards or an exam, and file search when the prompt is
+    substantive or a study tool needs the documents. Fewer tool schemas
+    mean fewer tokens and faster responses.
+
+    Args:
+        prompt: The user's chat message.
+        available: Enabled tools keyed by name (see TOOL_ORDER).
+
+    Returns:
+        The selected tools, in TOOL_ORDER.
+    """
+    selected = {name for name, pattern in _TOOL_PATTERNS if pattern.search(prompt)}
+
+    if _CALCULATE.search(prompt) and not selected.intersection(_CALCULATORS):
+        selected.update(_CALCULATORS)
+
+    if needs_retrieval(prompt) or selected.intersection(_STUDY_TOOLS):
+        selected.add("file_search")
+
+    return [available[name] for name in TOOL_ORDER if name in selected and name in available]
@@ -1,9 +1,26 @@
 # core/tools.py
 """Biochemical calculation tools for Gemini function calling."""
-import math
+import string
 from typing import List
 
+from core import tools_vectorized
+from core.tools_numba import henderson_hasselbalch, michaelis_menten
 
+# Option letters for multiple-choice questions (A, B, C, ...)
+_OPTION_LETTERS = tuple(string.ascii_uppercase)
+
+# Appended to the correct answer in exams
+_CHECK_MARK = " ✓"
+
+
+def _is_scalar(*values) -> bool:
+    """Whether every value is a plain number (Gemini only ever sends these)."""
+    return all(isinstance(value, (int, float)) for value in values)
+
+
+# The public tools validate and delegate to the kernels in core.tools_numba:
+# Gemini builds function declarations from the tools' signatures and
+# docstrings, which a Numba dispatcher doesn't expose.
 def calculate_ph(pka: float, acid_conc: float, base_conc: float) -> float:
     """
     Calculate pH using the Henderson-Hasselbalch equation.
@@ -28,10 +45,15 @@ def calculate_ph(pka: float, acid_conc: float, base_conc: float) -> float:
         >>> calculate_ph(pka=4.76, acid_conc=0.1, base_conc=0.05)
         4.459  # Acetic acid buffer
     """
+    # Array inputs (e.g. a concentration grid) are evaluated by NumPy in one pass
+    if not _is_scalar(pka, acid_conc, base_conc):
+        ph = tools_vectorized.calculate_ph(pka, acid_conc, base_conc)
+        return float(ph) if ph.ndim == 0 else ph
+
     if acid_conc <= 0 or base_conc <= 0:
         raise ValueError("Concentrations must be positive values")
 
-    return pka + math.log10(base_conc / acid_conc)
+    return henderson_hasselbalch(pka, acid_conc, base_conc)
 
 
 def enzyme_kinetics(v_max: float, km: float, substrate_conc: float) -> float:
@@ -46,22 +68,54 @@ def enzyme_kinetics(v_max: float, km: float, substrate_conc: float) -> float:
     Args:
         v_max: Maximum reaction velocity (Vmax) in appropriate units (e.g., umol/min).
         km: Michaelis constant (Km) in mol/L or mM.
-        substrate_conc: Substrate concentration [S] in same units as Km.
+        substrate_conc: Substrate concentration [S] in same units as Km (0 or more).
 
     Returns:
         The calculated reaction velocity in same units as Vmax.
 
     Raises:
-        ValueError: If any parameter is zero or negative.
+        ValueError: If Vmax or Km is zero or negative, or [S] is negative.
 
     Example:
         >>> enzyme_kinetics(v_max=100, km=10, substrate_conc=10)
         50.0  # At [S] = Km, velocity is Vmax/2
     """
-    if v_max <= 0 or km <= 0 or substrate_conc <= 0:
-        raise ValueError("All parameters must be positive values")
+    # Array inputs (e.g. an [S] sweep) are evaluated by NumPy in one pass
+    if not _is_scalar(v_max, km, substrate_conc):
+        velocity = tools_vectorized.enzyme_kinetics(v_max, km, substrate_conc)
+        return float(velocity) if velocity.ndim == 0 else velocity
+
+    if v_max <= 0 or km <= 0 or substrate_conc < 0:
+        raise ValueError("Vmax and Km must be positive and [S] must not be negative")
+
+    return michaelis_menten(v_max, km, substrate_conc)
 
-    return (v_max * substrate_conc) / (km + substrate_conc)
+
+def _pi_two(pka_values):
+    a, b = pka_values
+    return (a + b) * 0.5
+
+
+def _pi_three(pka_values):
+    # Three-element sorting network: cheaper than sorted() for n=3
+    low, mid, high = pka_values
+    if low > mid:
+        low, mid = mid, low
+    if mid > high:
+        mid, high = high, mid
+    if low > mid:
+        low, mid = mid, low
+
+    # Acidic amino acids: average of two lowest
+    # Basic amino acids: average of two highest
+    # Heuristic: if middle pKa < 7, it's acidic; otherwise basic
+    if mid < 7:
+        return (low + mid) * 0.5
+    return (mid + high) * 0.5
+
+
+# pI kernels keyed by the number of pKa values
+_PI_DISPATCH = {2: _pi_two, 3: _pi_three}
 
 
 def isoelectric_point(pka_values: List[float]) -> float:
@@ -89,24 +143,14 @@ def isoelectric_point(pka_values: List[float]) -> float:
         >>> isoelectric_point(pka_values=[1.88, 3.65, 9.60])  # Aspartate
         2.77
     """
-    if len(pka_values) < 2:
-        raise ValueError("At least 2 pKa values are required")
-
-    sorted_pkas = sorted(pka_values)
-
-    if len(sorted_pkas) == 2:
-        return (sorted_pkas[0] + sorted_pkas[1]) / 2
-    elif len(sorted_pkas) == 3:
-        # Acidic amino acids: average of two lowest
-        # Basic amino acids: average of two highest
-        # Heuristic: if middle pKa < 7, it's acidic; otherwise basic
-        if sorted_pkas[1] < 7:
-            return (sorted_pkas[0] + sorted_pkas[1]) / 2
-        else:
-            return (sorted_pkas[1] + sorted_pkas[2]) / 2
-    else:
+    kernel = _PI_DISPATCH.get(len(pka_values))
+    if kernel is None:
+        if len(pka_values) < 2:
+            raise ValueError("At least 2 pKa values are required")
         raise ValueError("Expected 2 or 3 pKa values")
 
+    return kernel(pka_values)
+
 
 def create_flashcards(topic: str, cards: List[dict]) -> str:
     """
@@ -138,16 +182,16 @@ def create_flashcards(topic: str, cards: List[dict]) -> str:
     if not cards:
         raise ValueError("Debe haber al menos una tarjeta")
 
-    output = f"📚 **Flashcards: {topic}**\n\n"
-
-    for i, card in enumerate(cards, 1):
-        pregunta = card.get("pregunta", "")
-        respuesta = card.get("respuesta", "")
-        output += f"🔹 **Tarjeta {i}**\n"
-        output += f"**Pregunta:** {pregunta}\n"
-        output += f"**Respuesta:** {respuesta}\n\n"
+    # One block per card, joined once at the end
+    blocks = [f"📚 **Flashcards: {topic}**"]
+    blocks.extend(
+        f"🔹 **Tarjeta {i}**\n"
+        f"**Pregunta:** {card.get('pregunta', '')}\n"
+        f"**Respuesta:** {card.get('respuesta', '')}"
+        for i, card in enumerate(cards, 1)
+    )
 
-    return output.strip()
+    return "\n\n".join(blocks).strip()
 
 
 def create_exam(topic: str, questions: List[dict]) -> str:
@@ -172,7 +216,8 @@ def create_exam(topic: str, questions: List[dict]) -> str:
         Formatted exam as text ready to display.
 
     Raises:
-        ValueError: If questions list is empty.
+        ValueError: If questions list is empty, or a question has more
+            options than there are letters (26).
 
     Example:
         >>> create_exam("Glucólisis", [
@@ -195,7 +240,8 @@ def create_exam(topic: str, questions: List[dict]) -> str:
     if not questions:
         raise ValueError("Debe haber al menos una pregunta")
 
-    output = f"📝 **Examen: {topic}**\n\n"
+    # One block of lines per question, joined once at the end
+    blocks = [f"📝 **Examen: {topic}**"]
 
     for i, q in enumerate(questions, 1):
         tipo = q.get("tipo", "opcion_multiple")
@@ -205,15 +251,16 @@ def create_exam(topic: str, questions: List[dict]) -> str:
 
         if tipo == "opcion_multiple":
             opciones = q.get("opciones", [])
-            output += f"**{i}. [Opción Múltiple]** {pregunta}\n"
-            for j, opcion in enumerate(opciones):
-                letra = chr(65 + j)  # A, B, C, D
-                marca = " ✓" if letra == respuesta else ""
-                output += f"   {letra}) {opcion}{marca}\n"
+            if len(opciones) > len(_OPTION_LETTERS):
+                raise ValueError(f"Una pregunta admite como máximo {len(_OPTION_LETTERS)} opciones")
+            lines = [f"**{i}. [Opción Múltiple]** {pregunta}"]
+            for letra, opcion in zip(_OPTION_LETTERS, opciones):
+                marca = _CHECK_MARK if letra == respuesta else ""
+                lines.append(f"   {letra}) {opcion}{marca}")
         else:  # verdadero_falso
-            output += f"**{i}. [V/F]** {pregunta}\n"
-            output += f"   **Respuesta:** {respuesta} ✓\n"
+            lines = [f"**{i}. [V/F]** {pregunta}", f"   **Respuesta:** {respuesta}{_CHECK_MARK}"]
 
-        output += f"   **Explicación:** {explicacion}\n\n"
+        lines.append(f"   **Explicación:** {explicacion}")
+        blocks.append("\n".join(lines))
 
-    return output.strip()
+    return "\n\n".join(blocks).strip()
@@ -0,0 +1,81 @@
+# core/tools_numba.py
+"""Numeric kernels behind core.tools and core.tools_vectorized.
+
+The kernels are JIT-compiled when Numba is installed and do no
+validation; callers check their inputs first. Without
+Numba the scalar kernels run as plain Python and the batch kernels fall
+back to NumPy expressions, so results are the same either way.
+"""
+from math import log as _log
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # Numba is optional
+    numba = None
+
+NUMBA_AVAILABLE = numba is not None
+
+# log10(x) == ln(x) * log10(e)
+_LOG10_E = 1.0 / _log(10)
+
+
+def _jit(func):
+    """Compile a scalar kernel with Numba when it is installed."""
+    if numba is None:
+        return func
+    return numba.njit(cache=True, fastmath=True)(func)
+
+
+@_jit
+def henderson_hasselbalch(pka, acid_conc, base_conc):
+    """pH of a buffer; concentrations must be positive."""
+    # Difference of natural logs: no division, and ln is cheaper than log10.
+    # _log is bound at import so the pure-Python path skips the math lookup.
+    return pka + (_log(base_conc) - _log(acid_conc)) * _LOG10_E
+
+
+@_jit
+def michaelis_menten(v_max, km, substrate_conc):
+    """Initial velocity v = Vmax[S] / (Km + [S])."""
+    return (v_max * substrate_conc) / (km + substrate_conc)
+
+
+if numba is not None:
+    @numba.njit(cache=True, fastmath=True, parallel=True)
+    def henderson_hasselbalch_batch(pka, acid_conc, base_conc):
+        """pH for each pair of 1-D float64 concentration arrays, across all cores."""
+        ph = np.empty(acid_conc.shape[0])
+        for i in numba.prange(acid_conc.shape[0]):
+            ph[i] = pka + (_log(base_conc[i]) - _log(acid_conc[i])) * _LOG10_E
+        return ph
+
+    @numba.njit(cache=True, fastmath=True, parallel=True)
+    def michaelis_menten_batch(v_max, km, substrate_conc):
+        """Velocity at each point of a 1-D float64 [S] array, across all cores."""
+        velocity = np.empty(substrate_conc.shape[0])
+        for i in numba.prange(substrate_conc.shape[0]):
+            velocity[i] = (v_max * substrate_conc[i]) / (km + substrate_conc[i])
+        return velocity
+else:
+    def henderson_hasselbalch_batch(pka, acid_conc, base_conc):
+        """pH for each pair of 1-D float64 concentration arrays."""
+        return pka + (np.log(base_conc) - np.log(acid_conc)) * _LOG10_E
+
+    def michaelis_menten_batch(v_max, km, substrate_conc):
+        """Velocity at each point of a 1-D float64 [S] array."""
+        return (v_max * substrate_conc) / (km + substrate_conc)
+
+
+def _warm_up() -> None:
+    """Compile every kernel now, so the first tool call doesn't pay for the JIT."""
+    henderson_hasselbalch(4.76, 0.1, 0.1)
+    michaelis_menten(100.0, 10.0, 10.0)
+    one = np.ones(1)
+    henderson_hasselbalch_batch(4.76, one, one)
+    michaelis_menten_batch(100.0, 10.0, one)
+
+
+if NUMBA_AVAILABLE:
+    _warm_up()
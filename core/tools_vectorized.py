@@ -0,0 +1,110 @@
+# core/tools_vectorized.py
+"""NumPy versions of the biochemical calculators for array inputs.
+
+These mirror the scalar functions in core.tools (which stay scalar for
+Gemini function calling) but evaluate whole arrays in one pass, e.g.
+pH over a grid of concentrations or a Michaelis-Menten curve. 1-D sweeps
+with scalar constants run on the batch kernels in core.tools_numba
+(parallel when Numba is installed); other shapes broadcast in NumPy.
+"""
+import numpy as np
+from numpy.typing import ArrayLike
+
+from core.tools_numba import henderson_hasselbalch_batch, michaelis_menten_batch
+
+
+def calculate_ph(pka: ArrayLike, acid_conc: ArrayLike, base_conc: ArrayLike) -> np.ndarray:
+    """
+    Calculate pH with the Henderson-Hasselbalch equation over arrays.
+
+    Args:
+        pka: pKa value(s) of the weak acid.
+        acid_conc: Weak acid concentration(s) in mol/L (must be positive).
+        base_conc: Conjugate base concentration(s) in mol/L (must be positive).
+
+    Returns:
+        Array of pH values, broadcast over the inputs.
+
+    Raises:
+        ValueError: If any concentration is zero or negative.
+
+    Example:
+        >>> calculate_ph(4.76, [0.1, 0.1], [0.05, 0.1])
+        array([4.459, 4.76 ])
+    """
+    acid = np.asarray(acid_conc, dtype=np.float64)
+    base = np.asarray(base_conc, dtype=np.float64)
+    if np.any(acid <= 0) or np.any(base <= 0):
+        raise ValueError("Concentrations must be positive values")
+
+    pka = np.asarray(pka, dtype=np.float64)
+    if pka.ndim == 0 and acid.ndim == 1 and acid.shape == base.shape:
+        return henderson_hasselbalch_batch(float(pka), acid, base)
+    return pka + np.log10(base / acid)
+
+
+def enzyme_kinetics(v_max: ArrayLike, km: ArrayLike, substrate_conc: ArrayLike) -> np.ndarray:
+    """
+    Calculate Michaelis-Menten velocities over arrays.
+
+    Args:
+        v_max: Maximum reaction velocity (Vmax).
+        km: Michaelis constant (Km).
+        substrate_conc: Substrate concentration(s) [S] in same units as Km (0 or more).
+
+    Returns:
+        Array of velocities in the units of Vmax, broadcast over the inputs.
+
+    Raises:
+        ValueError: If any Vmax or Km is zero or negative, or any [S] is negative.
+
+    Example:
+        >>> enzyme_kinetics(100, 10, [10, 1000])
+        array([50.        , 99.00990099])
+    """
+    v_max = np.asarray(v_max, dtype=np.float64)
+    km = np.asarray(km, dtype=np.float64)
+    substrate = np.asarray(substrate_conc, dtype=np.float64)
+    if np.any(v_max <= 0) or np.any(km <= 0) or np.any(substrate < 0):
+        raise ValueError("Vmax and Km must be positive and [S] must not be negative")
+
+    if v_max.ndim == 0 and km.ndim == 0 and substrate.ndim == 1:
+        return michaelis_menten_batch(float(v_max), float(km), substrate)
+    return v_max * substrate / (km + substrate)
+
+
+def isoelectric_point(pka_values: ArrayLike) -> np.ndarray:
+    """
+    Calculate isoelectric points for many amino acids at once.
+
+    Each row holds the pKa values of one amino acid (2 or 3 columns).
+    With 3 values the row is treated as acidic (average of the two
+    lowest) when the middle pKa is below 7, otherwise as basic (average
+    of the two highest), matching core.tools.isoelectric_point.
+
+    Args:
+        pka_values: Array of shape (n, 2) or (n, 3), or a single row.
+
+    Returns:
+        Array of n isoelectric points.
+
+    Raises:
+        ValueError: If rows don't have 2 or 3 pKa values.
+
+    Example:
+        >>> isoelectric_point([[2.18, 8.95, 10.53], [1.88, 3.65, 9.60]])  # Lys, Asp
+        array([9.74 , 2.765])
+    """
+    pkas = np.atleast_2d(np.asarray(pka_values, dtype=np.float64))
+    if pkas.shape[1] < 2:
+        raise ValueError("At least 2 pKa values are required")
+    if pkas.shape[1] > 3:
+        raise ValueError("Expected 2 or 3 pKa values")
+
+    sorted_pkas = np.sort(pkas, axis=1)
+    if sorted_pkas.shape[1] == 2:
+        return (sorted_pkas[:, 0] + sorted_pkas[:, 1]) / 2
+
+    acidic = (sorted_pkas[:, 0] + sorted_pkas[:, 1]) / 2
+    basic = (sorted_pkas[:, 1] + sorted_pkas[:, 2]) / 2
+    return np.where(sorted_pkas[:, 1] < 7, acidic, basic)
@@ -8,10 +8,16 @@ uploads each PDF, and saves the store configuration.
 Usage:
     python scripts/index_pdfs.py
 """
+import functools
+import math
 import os
 import sys
+import threading
+import time
 import unicodedata
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
+from typing import Callable, Optional
 
 # Add project root to path for imports
 PROJECT_ROOT = Path(__file__).parent.parent
@@ -20,13 +26,116 @@ sys.path.insert(0, str(PROJECT_ROOT))
 import tomllib
 
 from core.client import get_client
-from core.rag_manager import RAGManager
+from core.rag_manager import RAGManager, is_throttled
+
+# Uploads run concurrently; each one waits on the Gemini API, not the CPU
+MAX_UPLOAD_WORKERS = 8
+UPLOAD_TIMEOUT = 900  # 15 minutes per file for large PDFs
+
+# Times a throttled upload is re-submitted before it counts as failed
+MAX_THROTTLE_RETRIES = 3
+
+# Greek letters spelled out, so "β-oxidación" keeps its meaning in ASCII
+_GREEK_NAMES = {
+    "α": "alfa", "β": "beta", "γ": "gamma", "δ": "delta", "ε": "epsilon",
+    "ζ": "zeta", "η": "eta", "θ": "theta", "ι": "iota", "κ": "kappa",
+    "λ": "lambda", "μ": "mu", "ν": "nu", "ξ": "xi", "ο": "omicron",
+    "π": "pi", "ρ": "rho", "σ": "sigma", "ς": "sigma", "τ": "tau",
+    "υ": "upsilon", "φ": "phi", "χ": "chi", "ψ": "psi", "ω": "omega",
+}
+_GREEK_TO_ASCII = str.maketrans({
+    **_GREEK_NAMES,
+    **{letter.upper(): name.capitalize() for letter, name in _GREEK_NAMES.items() if letter != "ς"},
+})
+
+
+class AIMDController:
+    """
+    Adaptive limit on in-flight uploads (additive increase, multiplicative decrease).
 
+    Every `window` completed uploads the controller compares throughput
+    with the previous window: if it improved, the depth grows by one; if
+    an upload was throttled or p95 latency doubled, the depth shrinks
+    to `backoff` times its value. Workers call acquire() before
+    uploading and release() after.
+    """
 
+    def __init__(self, initial: int = 2, maximum: int = MAX_UPLOAD_WORKERS,
+                 window: int = 5, backoff: float = 0.8, clock=time.monotonic):
+        """
+        Initialize the controller.
+
+        Args:
+            initial: Starting number of concurrent uploads.
+            maximum: Upper bound for the depth.
+            window: Completed uploads between adjustments.
+            backoff: Factor applied to the depth when throttled.
+            clock: Monotonic time source (injectable for tests).
+        """
+        self.depth = initial
+        self.maximum = maximum
+        self.window = window
+        self.backoff = backoff
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._window_start = clock()
+        self._latencies: list[float] = []
+        self._throttled = False
+        self._last_throughput: Optional[float] = None
+        self._baseline_p95: Optional[float] = None
+
+    def acquire(self) -> None:
+        """Block until another upload may start."""
+        with self._condition:
+            while self._in_flight >= self.depth:
+                self._condition.wait()
+            self._in_flight += 1
+
+    def release(self, latency: float, throttled: bool = False) -> None:
+        """
+        Record a finished upload and free its slot.
+
+        Args:
+            latency: Seconds the upload took.
+            throttled: Whether the API rejected it with a throttling error.
+        """
+        with self._condition:
+            self._in_flight -= 1
+            self._latencies.append(latency)
+            self._throttled = self._throttled or throttled
+            if len(self._latencies) >= self.window:
+                self._adjust()
+            self._condition.notify_all()
+
+    def _adjust(self) -> None:
+        """Update the depth from the window that just completed."""
+        now = self._clock()
+        throughput = len(self._latencies) / max(now - self._window_start, 1e-9)
+        latencies = sorted(self._latencies)
+        p95 = latencies[math.ceil(0.95 * len(latencies)) - 1]
+
+        latency_spike = self._baseline_p95 is not None and p95 > 2 * self._baseline_p95
+        if self._throttled or latency_spike:
+            self.depth = max(1, int(self.depth * self.backoff))
+        elif self._last_throughput is None or throughput > self._last_throughput:
+            self.depth = min(self.maximum, self.depth + 1)
+
+        self._last_throughput = throughput
+        if self._baseline_p95 is None or p95 < self._baseline_p95:
+            self._baseline_p95 = p95
+        self._window_start = now
+        self._latencies = []
+        self._throttled = False
+
+
+@functools.lru_cache(maxsize=1)
 def load_api_key() -> str:
     """
     Load API key from .streamlit/secrets.toml.
 
+    The file is read once per process; later calls reuse the key.
+
     Returns:
         The Google API key string.
 
@@ -43,8 +152,7 @@ def load_api_key() -> str:
             "and add your API key."
         )
 
-    with open(secrets_path, "rb") as f:
-        secrets = tomllib.load(f)
+    secrets = tomllib.loads(secrets_path.read_text(encoding="utf-8"))
 
     api_key = secrets.get("GOOGLE_API_KEY")
     if not api_key or api_key == "tu_api_key_de_gemini_aqui":
@@ -59,11 +167,18 @@ def find_pdfs() -> list[Path]:
     """
     Find all PDF files in the project root directory.
 
+    The suffix match is case-insensitive, so "Libro.PDF" is found too.
+
     Returns:
         List of Path objects for each PDF found.
     """
-    pdfs = list(PROJECT_ROOT.glob("*.pdf"))
-    return sorted(pdfs, key=lambda p: p.name.lower())
+    with os.scandir(PROJECT_ROOT) as entries:
+        pdfs = [
+            Path(entry.path) for entry in entries
+            if entry.name.lower().endswith(".pdf") and entry.is_file()
+        ]
+    pdfs.sort(key=lambda p: p.name.lower())
+    return pdfs
 
 
 def normalize_filename(name: str) -> str:
@@ -71,7 +186,8 @@ def normalize_filename(name: str) -> str:
     Normalize filename to ASCII-safe characters.
 
     Removes accents and special Unicode characters that may cause
-    encoding issues with the Gemini API.
+    encoding issues with the Gemini API. Greek letters are spelled out
+    ("β-amilasa" -> "beta-amilasa") so distinct names stay distinct.
 
     Args:
         name: Original filename with possible accents.
@@ -79,11 +195,125 @@ def normalize_filename(name: str) -> str:
     Returns:
         ASCII-safe version of the filename.
     """
-    # Normalize to decomposed form (separate base char and accents)
-    normalized = unicodedata.normalize('NFD', name)
-    # Remove accent marks (combining characters)
-    ascii_safe = ''.join(c for c in normalized if unicodedata.category(c) != 'Mn')
-    return ascii_safe
+    # Decompose accented and compatibility characters (é -> e + ´, ﬁ -> fi,
+    # µ -> μ), spell out Greek letters, then drop everything left outside
+    # ASCII in a single C-level encode
+    normalized = unicodedata.normalize('NFKD', name).translate(_GREEK_TO_ASCII)
+    return normalized.encode('ascii', 'ignore').decode('ascii')
+
+
+def upload_one(rag_manager: RAGManager, pdf_path: Path) -> tuple[Path, str, Optional[str]]:
+    """
+    Upload a single PDF to the store.
+
+    Args:
+        rag_manager: RAG manager with the store already created.
+        pdf_path: Path of the PDF to upload.
+
+    RAGManager retries throttled status checks itself, so "throttled"
+    only comes from the start call: the API refused the file and it is
+    not in the store.
+
+    Returns:
+        Tuple (pdf_path, status, error) where status is "ok", "timeout",
+        "throttled" or "error", and error is the failure message (None on success).
+    """
+    try:
+        rag_manager.upload_file(
+            file_path=str(pdf_path),
+            display_name=normalize_filename(pdf_path.name),
+            timeout=UPLOAD_TIMEOUT,
+            # Workers wait on one shared poller instead of each polling alone
+            shared_poll=True
+        )
+        return pdf_path, "ok", None
+    except TimeoutError as e:
+        return pdf_path, "timeout", str(e)
+    except Exception as e:
+        if is_throttled(e):
+            return pdf_path, "throttled", str(e)
+        return pdf_path, "error", str(e)
+
+
+def upload_with_controller(
+    controller: AIMDController, rag_manager: RAGManager, pdf_path: Path
+) -> tuple[Path, str, Optional[str]]:
+    """
+    Upload a PDF once the controller allows another upload in flight.
+
+    Args:
+        controller: Adaptive concurrency controller shared by all workers.
+        rag_manager: RAG manager with the store already created.
+        pdf_path: Path of the PDF to upload.
+
+    Returns:
+        Same tuple as upload_one().
+    """
+    controller.acquire()
+    start = time.monotonic()
+    result = upload_one(rag_manager, pdf_path)
+    controller.release(time.monotonic() - start, throttled=result[1] == "throttled")
+    return result
+
+
+def print_result(result: tuple[Path, str, Optional[str]]) -> None:
+    """Print one final upload result as returned by upload_one()."""
+    pdf_path, status, error = result
+    if status == "ok":
+        print(f"   ✓ {pdf_path.name}")
+    elif status == "timeout":
+        print(f"   ⏱️ {pdf_path.name}: Timeout: {error}")
+    elif status == "throttled":
+        print(f"   🐢 {pdf_path.name}: Límite de la API: {error}")
+    else:
+        print(f"   ✗ {pdf_path.name}: Error: {error}")
+
+
+def upload_pdfs(
+    rag_manager: RAGManager,
+    pdfs: list[Path],
+    controller: AIMDController,
+    report: Callable[[tuple[Path, str, Optional[str]]], None] = lambda result: None,
+) -> list[tuple[Path, str, Optional[str]]]:
+    """
+    Upload PDFs concurrently, re-submitting the ones the API throttled.
+
+    Only uploads the API refused to start are re-submitted; a file whose
+    status checks were throttled was already accepted and is polled
+    again instead, so nothing is uploaded twice. The throttled upload
+    has made the controller lower its depth, so the retry waits for a
+    slot under the new limit.
+
+    Args:
+        rag_manager: RAG manager with the store already created.
+        pdfs: PDFs to upload.
+        controller: Adaptive concurrency controller shared by all workers.
+        report: Called with each final result as soon as it is known.
+
+    Returns:
+        One (pdf_path, status, error) tuple per PDF, in completion order.
+    """
+    results = []
+    retries = dict.fromkeys(pdfs, 0)
+
+    with ThreadPoolExecutor(max_workers=MAX_UPLOAD_WORKERS) as executor:
+        pending = {
+            executor.submit(upload_with_controller, controller, rag_manager, pdf_path)
+            for pdf_path in pdfs
+        }
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                pdf_path, status, _ = result
+                if status == "throttled" and retries[pdf_path] < MAX_THROTTLE_RETRIES:
+                    retries[pdf_path] += 1
+                    pending.add(executor.submit(upload_with_controller, controller, rag_manager, pdf_path))
+                    continue
+                results.append(result)
+                report(result)
+
+    return results
 
 
 def main():
@@ -115,28 +345,13 @@ def main():
     rag_manager.create_store(display_name=store_name)
     print(f"   Store creado: {rag_manager.store_name}")
 
-    # Upload each PDF
-    success_count = 0
-    error_count = 0
-
-    for pdf_path in pdfs:
-        display_name = normalize_filename(pdf_path.name)
-        print(f"📤 Subiendo {pdf_path.name}...", end=" ", flush=True)
-
-        try:
-            rag_manager.upload_file(
-                file_path=str(pdf_path),
-                display_name=display_name,
-                timeout=900  # 15 minutes per file for large PDFs
-            )
-            print("✓")
-            success_count += 1
-        except TimeoutError as e:
-            print(f"⏱️ Timeout: {e}")
-            error_count += 1
-        except Exception as e:
-            print(f"✗ Error: {e}")
-            error_count += 1
+    # Upload PDFs concurrently, reporting each one as it finishes
+    print(f"📤 Subiendo {len(pdfs)} PDFs (hasta {MAX_UPLOAD_WORKERS} en paralelo)...")
+    results = upload_pdfs(rag_manager, pdfs, AIMDController(), report=print_result)
+
+    results.sort(key=lambda result: result[0].name.lower())
+    success_count = sum(1 for _, status, _ in results if status == "ok")
+    error_count = len(results) - success_count
 
     # Summary
     config_path = PROJECT_ROOT / ".streamlit" / "rag_store.json"
@@ -146,6 +361,9 @@ def main():
     else:
         print(f"⚠️ Indexacion completada con {error_count} errores.")
         print(f"   {success_count}/{len(pdfs)} archivos subidos exitosamente.")
+        for pdf_path, status, _ in results:
+            if status != "ok":
+                print(f"   - {pdf_path.name} ({status})")
         print(f"   Store guardado en {config_path.relative_to(PROJECT_ROOT)}")
 
 
@@ -0,0 +1,183 @@
+# tests/_fakes.py
+"""Hand-rolled fakes for the Gemini client surface used by core/."""
+import asyncio
+import math
+from dataclasses import dataclass, field, replace
+from typing import Callable, Optional, Union
+
+STORE_NAME = "stores/test-store-123"
+
+# Polls needed by an operation that never finishes
+NEVER = math.inf
+
+
+@dataclass
+class FakeClock:
+    """Clock whose sleep() advances monotonic() instantly."""
+
+    now: float = 0.0
+    sleeps: list = field(default_factory=list)
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@dataclass
+class FakeStore:
+    """A file search store."""
+
+    name: str = STORE_NAME
+
+
+@dataclass(frozen=True)
+class FakeOperation:
+    """A long-running upload operation that is done after `remaining` more polls."""
+
+    name: str = "operations/upload"
+    remaining: float = 0
+
+    @property
+    def done(self) -> bool:
+        return self.remaining <= 0
+
+    def polled(self) -> "FakeOperation":
+        return replace(self, remaining=self.remaining - 1)
+
+
+@dataclass
+class FakeFiles:
+    """client.file_search_stores.files"""
+
+    documents: list = field(default_factory=list)
+    list_calls: int = 0
+
+    def list(self, file_search_store_name):
+        self.list_calls += 1
+        return list(self.documents)
+
+
+@dataclass
+class FakeFileSearchStores:
+    """
+    client.file_search_stores
+
+    upload_result is either the operation to return or a callable
+    (file, file_search_store_name, config) -> operation.
+    """
+
+    files: FakeFiles = field(default_factory=FakeFiles)
+    store: FakeStore = field(default_factory=FakeStore)
+    upload_result: Union[FakeOperation, Callable[..., FakeOperation]] = field(default_factory=FakeOperation)
+    create_calls: list = field(default_factory=list)
+    get_calls: list = field(default_factory=list)
+    upload_calls: list = field(default_factory=list)
+
+    def create(self, config):
+        self.create_calls.append(config)
+        return self.store
+
+    def get(self, name):
+        self.get_calls.append(name)
+        return FakeStore(name)
+
+    def upload_to_file_search_store(self, file, file_search_store_name, config):
+        self.upload_calls.append((file, file_search_store_name, config))
+        if callable(self.upload_result):
+            return self.upload_result(file, file_search_store_name, config)
+        return self.upload_result
+
+
+@dataclass
+class FakeOperations:
+    """
+    client.operations: each get() counts as one poll.
+
+    get() first raises the queued errors one at a time, then raises error
+    on every call if it is set.
+    """
+
+    error: Optional[Exception] = None
+    errors: list = field(default_factory=list)
+    get_calls: int = 0
+
+    def get(self, operation):
+        self.get_calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        if self.error is not None:
+            raise self.error
+        return operation.polled()
+
+
+@dataclass
+class FakeModels:
+    """client.models"""
+
+    names: list = field(default_factory=lambda: ["models/gemini"])
+    error: Optional[Exception] = None
+    list_calls: int = 0
+
+    def list(self):
+        self.list_calls += 1
+        if self.error is not None:
+            raise self.error
+        return iter(self.names)
+
+
+@dataclass
+class FakeAsyncFileSearchStores:
+    """
+    client.aio.file_search_stores
+
+    Each upload takes upload_delay seconds; in_flight and peak_in_flight
+    track how many uploads overlap.
+    """
+
+    upload_delay: float = 0.0
+    remaining: float = 0
+    upload_calls: list = field(default_factory=list)
+    in_flight: int = 0
+    peak_in_flight: int = 0
+
+    async def upload_to_file_search_store(self, file, file_search_store_name, config):
+        self.upload_calls.append((file, file_search_store_name, config))
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.upload_delay)
+        finally:
+            self.in_flight -= 1
+        return FakeOperation(name=f"operations/{config['display_name']}", remaining=self.remaining)
+
+
+@dataclass
+class FakeAsyncOperations:
+    """client.aio.operations: each get() counts as one poll."""
+
+    get_calls: int = 0
+
+    async def get(self, operation):
+        self.get_calls += 1
+        return operation.polled()
+
+
+@dataclass
+class FakeAsyncClient:
+    """client.aio"""
+
+    file_search_stores: FakeAsyncFileSearchStores = field(default_factory=FakeAsyncFileSearchStores)
+    operations: FakeAsyncOperations = field(default_factory=FakeAsyncOperations)
+
+
+@dataclass
+class FakeClient:
+    """Stand-in for genai.Client with explicit attributes and recorded calls."""
+
+    file_search_stores: FakeFileSearchStores = field(default_factory=FakeFileSearchStores)
+    operations: FakeOperations = field(default_factory=FakeOperations)
+    models: FakeModels = field(default_factory=FakeModels)
+    aio: FakeAsyncClient = field(default_factory=FakeAsyncClient)
@@ -0,0 +1,44 @@
+# tests/test_chat_store.py
+
+
+def test_append_and_count(tmp_path):
+    """Messages should be counted per session."""
+    from core.chat_store import ChatStore
+
+    store = ChatStore(db_path=tmp_path / "chat.db")
+    assert store.append("s1", "user", "hola") == 0
+    assert store.append("s1", "assistant", "¡Hola, Jimena!") == 1
+    store.append("s2", "user", "otra sesión")
+
+    assert store.count("s1") == 2
+    assert store.count("s2") == 1
+    assert store.count("missing") == 0
+    store.close()
+
+
+def test_load_pages_back_from_newest(tmp_path):
+    """Pages should skip the newest messages and keep chronological order."""
+    from core.chat_store import ChatStore
+
+    store = ChatStore(db_path=tmp_path / "chat.db")
+    for i in range(5):
+        store.append("s1", "user", f"mensaje {i}")
+
+    assert [m["content"] for m in store.load("s1", limit=2)] == ["mensaje 3", "mensaje 4"]
+    assert [m["content"] for m in store.load("s1", limit=2, offset=2)] == ["mensaje 1", "mensaje 2"]
+    assert store.load("s1", limit=2, offset=4) == [{"role": "user", "content": "mensaje 0"}]
+    store.close()
+
+
+def test_history_persists_across_instances(tmp_path):
+    """Reopening the database should keep earlier messages."""
+    from core.chat_store import ChatStore
+
+    db_path = tmp_path / "chat.db"
+    store = ChatStore(db_path=db_path)
+    store.append("s1", "user", "¿Qué es la Km?")
+    store.close()
+
+    reopened = ChatStore(db_path=db_path)
+    assert reopened.load("s1", limit=10) == [{"role": "user", "content": "¿Qué es la Km?"}]
+    reopened.close()
@@ -2,6 +2,18 @@
 import pytest
 from unittest.mock import patch, MagicMock
 
+from tests._fakes import FakeClient
+
+
+@pytest.fixture(autouse=True)
+def _clear_client_cache():
+    """Each test builds its client from its own environment."""
+    from core.client import get_client
+
+    get_client.cache_clear()
+    yield
+    get_client.cache_clear()
+
 
 def test_get_client_returns_genai_client():
     """Client should be created with API key from environment."""
@@ -24,3 +36,39 @@ def test_get_client_raises_without_api_key():
             import core.client
             reload(core.client)
             core.client.get_client()
+
+
+def test_get_client_is_memoized():
+    """Repeated calls should reuse the first client."""
+    with patch.dict("os.environ", {"GOOGLE_API_KEY": "test-key"}):
+        with patch("google.genai.Client") as mock_client:
+            from core.client import get_client
+
+            assert get_client() is get_client()
+            mock_client.assert_called_once_with(api_key="test-key")
+
+
+def test_warm_up_lists_models_in_background():
+    """Warm-up should issue a cheap request from a daemon thread."""
+    from core.client import warm_up
+
+    client = FakeClient()
+
+    thread = warm_up(client)
+    thread.join(timeout=5)
+
+    assert thread.daemon
+    assert client.models.list_calls == 1
+
+
+def test_warm_up_ignores_errors():
+    """A failed warm-up must not raise."""
+    from core.client import warm_up
+
+    client = FakeClient()
+    client.models.error = RuntimeError("network down")
+
+    thread = warm_up(client)
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
@@ -8,7 +8,11 @@ import pytest
 # Add scripts to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
 
-from index_pdfs import find_pdfs, load_api_key, PROJECT_ROOT
+from index_pdfs import (
+    AIMDController, find_pdfs, load_api_key, normalize_filename, upload_one, upload_pdfs, PROJECT_ROOT
+)
+from core.rag_manager import RAGManager
+from tests._fakes import FakeClient, FakeOperation
 
 
 class TestFindPdfs:
@@ -33,9 +37,29 @@ class TestFindPdfs:
         assert all(isinstance(p, Path) for p in pdfs)
 
 
+    def test_matches_suffix_case_insensitively(self, tmp_path):
+        """Should include .PDF files and skip directories and other files."""
+        (tmp_path / "b.PDF").write_bytes(b"%PDF")
+        (tmp_path / "a.pdf").write_bytes(b"%PDF")
+        (tmp_path / "notas.txt").write_text("x")
+        (tmp_path / "carpeta.pdf").mkdir()
+
+        with patch("index_pdfs.PROJECT_ROOT", tmp_path):
+            pdfs = find_pdfs()
+
+        assert [p.name for p in pdfs] == ["a.pdf", "b.PDF"]
+
+
 class TestLoadApiKey:
     """Tests for load_api_key function."""
 
+    @pytest.fixture(autouse=True)
+    def _clear_cache(self):
+        """Each test patches PROJECT_ROOT, so the memoized key must not leak."""
+        load_api_key.cache_clear()
+        yield
+        load_api_key.cache_clear()
+
     def test_raises_if_secrets_not_found(self, tmp_path):
         """Should raise FileNotFoundError if secrets.toml doesn't exist."""
         with patch("index_pdfs.PROJECT_ROOT", tmp_path):
@@ -63,3 +87,196 @@ class TestLoadApiKey:
         with patch("index_pdfs.PROJECT_ROOT", tmp_path):
             api_key = load_api_key()
             assert api_key == "test-api-key-123"
+
+    def test_reads_secrets_once(self, tmp_path):
+        """Repeated calls should not re-read secrets.toml."""
+        secrets_dir = tmp_path / ".streamlit"
+        secrets_dir.mkdir()
+        secrets_file = secrets_dir / "secrets.toml"
+        secrets_file.write_text('GOOGLE_API_KEY = "test-api-key-123"')
+
+        with patch("index_pdfs.PROJECT_ROOT", tmp_path):
+            load_api_key()
+            secrets_file.unlink()
+            assert load_api_key() == "test-api-key-123"
+
+
+class TestNormalizeFilename:
+    """Tests for normalize_filename function."""
+
+    def test_strips_accents(self):
+        """Accented letters should keep their base character."""
+        assert normalize_filename("Bioquímica Básica - Lehninger.pdf") == "Bioquimica Basica - Lehninger.pdf"
+
+    def test_ascii_names_unchanged(self):
+        """Pure ASCII names should pass through untouched."""
+        assert normalize_filename("Stryer_Biochemistry_8e.pdf") == "Stryer_Biochemistry_8e.pdf"
+
+    def test_output_is_ascii(self):
+        """Ligatures decompose and Greek letters are spelled out."""
+        result = normalize_filename("ﬁbras β-plegada.pdf")
+
+        assert result == "fibras beta-plegada.pdf"
+        assert result.isascii()
+
+    def test_greek_letters_do_not_collide(self):
+        """Names that differ only in a Greek letter must stay distinct."""
+        names = ["α-amilasa.pdf", "β-amilasa.pdf", "Δ-hélice.pdf", "β-oxidación.pdf"]
+
+        result = [normalize_filename(name) for name in names]
+
+        assert result == ["alfa-amilasa.pdf", "beta-amilasa.pdf", "Delta-helice.pdf", "beta-oxidacion.pdf"]
+        assert len(set(result)) == len(names)
+
+
+class TestUploadOne:
+    """Tests for upload_one function."""
+
+    def test_returns_ok_on_success(self):
+        """Should report a successful upload with an ASCII display name."""
+        rag_manager = MagicMock()
+        pdf_path = Path("Unidad 7 Ácidos nucleicos (final).pdf")
+
+        result = upload_one(rag_manager, pdf_path)
+
+        assert result == (pdf_path, "ok", None)
+        _, kwargs = rag_manager.upload_file.call_args
+        assert kwargs["display_name"] == "Unidad 7 Acidos nucleicos (final).pdf"
+        assert kwargs["shared_poll"] is True
+
+    def test_returns_timeout_status(self):
+        """Should report timeouts without raising."""
+        rag_manager = MagicMock()
+        rag_manager.upload_file.side_effect = TimeoutError("too slow")
+
+        _, status, error = upload_one(rag_manager, Path("UNIDAD 3 ENZIMAS.pdf"))
+
+        assert status == "timeout"
+        assert error == "too slow"
+
+    def test_returns_throttled_status(self):
+        """Should flag 429/503 API errors so concurrency can back off."""
+        rag_manager = MagicMock()
+        error = RuntimeError("resource exhausted")
+        error.code = 429
+        rag_manager.upload_file.side_effect = error
+
+        _, status, _ = upload_one(rag_manager, Path("UNIDAD 3 ENZIMAS.pdf"))
+
+        assert status == "throttled"
+
+    def test_returns_error_status(self):
+        """Should report any other failure without raising."""
+        rag_manager = MagicMock()
+        rag_manager.upload_file.side_effect = RuntimeError("quota exceeded")
+
+        _, status, error = upload_one(rag_manager, Path("UNIDAD 3 ENZIMAS.pdf"))
+
+        assert status == "error"
+        assert error == "quota exceeded"
+
+
+class TestUploadPdfs:
+    """Tests for upload_pdfs function."""
+
+    @staticmethod
+    def _throttle_error():
+        error = RuntimeError("429 RESOURCE_EXHAUSTED")
+        error.code = 429
+        return error
+
+    def test_resubmits_throttled_uploads(self):
+        """A throttled file should be retried instead of reported as failed."""
+        rag_manager = MagicMock()
+        rag_manager.upload_file.side_effect = [self._throttle_error(), True]
+        reported = []
+
+        results = upload_pdfs(rag_manager, [Path("Unidad 1.pdf")], AIMDController(), reported.append)
+
+        assert results == [(Path("Unidad 1.pdf"), "ok", None)]
+        assert reported == results
+        assert rag_manager.upload_file.call_count == 2
+
+    def test_throttled_status_check_does_not_reupload(self, tmp_path):
+        """A 429 while polling should back off and poll again, not upload a second copy."""
+        client = FakeClient()
+        client.file_search_stores.upload_result = FakeOperation(remaining=2)
+        client.operations.errors = [self._throttle_error()]
+        rag_manager = RAGManager(client, config_path=tmp_path / "rag_store.json")
+        rag_manager.create_store("test-store")
+
+        with patch("core.rag_manager.POLL_INITIAL_DELAY", 0.01):
+            results = upload_pdfs(rag_manager, [Path("Unidad 1.pdf")], AIMDController())
+
+        assert results == [(Path("Unidad 1.pdf"), "ok", None)]
+        assert len(client.file_search_stores.upload_calls) == 1
+        assert client.operations.get_calls == 3
+
+    def test_gives_up_after_max_retries(self):
+        """A file that stays throttled is reported once retries run out."""
+        rag_manager = MagicMock()
+        rag_manager.upload_file.side_effect = self._throttle_error()
+
+        with patch("index_pdfs.MAX_THROTTLE_RETRIES", 2):
+            results = upload_pdfs(rag_manager, [Path("Unidad 1.pdf")], AIMDController())
+
+        assert [status for _, status, _ in results] == ["throttled"]
+        assert rag_manager.upload_file.call_count == 3
+
+
+class TestAIMDController:
+    """Tests for the adaptive upload concurrency controller."""
+
+    def _complete_window(self, controller, clock, duration, latency=1.0, throttled=False):
+        """Run one window of uploads that takes `duration` seconds overall."""
+        for _ in range(controller.window):
+            controller.acquire()
+            controller.release(latency, throttled=throttled)
+        clock["now"] += duration
+
+    def test_increases_depth_while_throughput_improves(self):
+        """Depth should grow by one after each faster window."""
+        clock = {"now": 0.0}
+        controller = AIMDController(initial=2, window=2, clock=lambda: clock["now"])
+
+        clock["now"] = 10.0
+        self._complete_window(controller, clock, duration=5.0)
+        assert controller.depth == 3
+
+        self._complete_window(controller, clock, duration=0.0)
+        assert controller.depth == 4
+
+    def test_backs_off_when_throttled(self):
+        """A throttled upload should shrink depth multiplicatively."""
+        clock = {"now": 0.0}
+        controller = AIMDController(initial=2, window=2, clock=lambda: clock["now"])
+        controller.depth = 5
+
+        clock["now"] = 1.0
+        self._complete_window(controller, clock, duration=1.0, throttled=True)
+
+        assert controller.depth == 4
+
+    def test_backs_off_on_latency_spike(self):
+        """Doubling p95 latency should shrink depth."""
+        clock = {"now": 0.0}
+        controller = AIMDController(initial=3, window=2, clock=lambda: clock["now"])
+
+        clock["now"] = 1.0
+        self._complete_window(controller, clock, duration=1.0, latency=1.0)
+        assert controller.depth == 4
+
+        self._complete_window(controller, clock, duration=1.0, latency=5.0)
+        assert controller.depth == 3
+
+    def test_depth_never_exceeds_maximum(self):
+        """Depth should stay within the configured maximum."""
+        clock = {"now": 0.0}
+        controller = AIMDController(initial=2, maximum=2, window=1, clock=lambda: clock["now"])
+
+        for _ in range(3):
+            clock["now"] += 1.0
+            controller.acquire()
+            controller.release(0.1)
+
+        assert controller.depth == 2
@@ -14,17 +14,14 @@ class TestIntegration:
     def test_tool_invocation_ph_calculation(self):
         """Verify Gemini calls our pH tool correctly."""
         from core.client import get_client
-        from core.tools import calculate_ph
-        from google.genai import types
+        from core.tool_configs import build_config
 
         client = get_client()
 
         response = client.models.generate_content(
             model="gemini-2.5-flash",
             contents="Calculate the pH of a buffer with pKa=4.76, 0.1M acetic acid, and 0.05M acetate.",
-            config=types.GenerateContentConfig(
-                tools=[calculate_ph]
-            )
+            config=build_config("", ("calculate_ph",))
         )
 
         # Response should contain the calculated pH value ~4.46
@@ -33,8 +30,7 @@ class TestIntegration:
     def test_system_prompt_enforces_tool_use(self):
         """Verify system prompt makes Gemini use tools for calculations."""
         from core.client import get_client
-        from core.tools import calculate_ph, enzyme_kinetics
-        from google.genai import types
+        from core.tool_configs import build_config
 
         client = get_client()
 
@@ -44,10 +40,7 @@ class TestIntegration:
         response = client.models.generate_content(
             model="gemini-2.5-flash",
             contents="What is the reaction velocity when Vmax=100, Km=10, and [S]=10?",
-            config=types.GenerateContentConfig(
-                system_instruction=system_instruction,
-                tools=[calculate_ph, enzyme_kinetics]
-            )
+            config=build_config(system_instruction, ("calculate_ph", "enzyme_kinetics"))
         )
 
         # Response should contain 50 (Vmax/2 when [S]=Km)
@@ -0,0 +1,36 @@
+# tests/test_query_validator.py
+import pytest
+
+
+@pytest.mark.parametrize("prompt", ["hola", "¡Gracias!", "ok, gracias", "Muchas gracias", "jajaja", "Sí, gracias"])
+def test_is_small_talk_detects_filler(prompt):
+    """Greetings, thanks and acknowledgements need no model call."""
+    from core.query_validator import is_small_talk
+
+    assert is_small_talk(prompt)
+
+
+@pytest.mark.parametrize("prompt", [
+    "¿Qué es la glucólisis?", "Km", "Calcula el pH", "hola, ¿qué es la Vmax?",
+    "no entiendo", "No, no entiendo", "ya entiendo", "gracias, pero no entiendo", "ok", "👍",
+])
+def test_is_small_talk_keeps_questions(prompt):
+    """Biochemistry content, confusion and bare acknowledgements must reach the model."""
+    from core.query_validator import is_small_talk
+
+    assert not is_small_talk(prompt)
+
+
+def test_needs_retrieval_for_full_questions():
+    """Full questions should search the indexed documents."""
+    from core.query_validator import needs_retrieval
+
+    assert needs_retrieval("¿Cuál es la enzima reguladora de la glucólisis?")
+
+
+def test_needs_retrieval_skips_short_prompts():
+    """Very short prompts are answered without the file search tool."""
+    from core.query_validator import needs_retrieval
+
+    assert not needs_retrieval("Km")
+    assert not needs_retrieval("gracias, muy bien")
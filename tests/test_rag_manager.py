@@ -1,146 +1,403 @@
 # tests/test_rag_manager.py
+import asyncio
+import itertools
+import json
 import pytest
-from unittest.mock import MagicMock, patch
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
 
+from core.rag_manager import POLL_INITIAL_DELAY, POLL_JITTER, POLL_MAX_DELAY, RAGManager
+from tests._fakes import NEVER, STORE_NAME, FakeClient, FakeClock, FakeOperation, FakeStore
+
+
+@pytest.fixture
+def client():
+    """Fake Gemini client, shared with the manager fixture."""
+    return FakeClient()
+
+
+@pytest.fixture
+def manager(client, tmp_path):
+    """RAGManager with a store created, persisting its config under tmp_path."""
+    manager = RAGManager(client=client, config_path=tmp_path / "rag_store.json")
+    manager.create_store("test-store")
+    return manager
 
-def test_create_file_search_store():
-    """Should create a file search store with given name."""
-    mock_client = MagicMock()
-    mock_store = MagicMock()
-    mock_store.name = "stores/test-store-123"
-    mock_client.file_search_stores.create.return_value = mock_store
 
-    from core.rag_manager import RAGManager
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake clock installed as time.sleep/time.monotonic for the polling loops."""
+    clock = FakeClock()
+    monkeypatch.setattr('core.rag_manager.time.sleep', clock.sleep)
+    monkeypatch.setattr('core.rag_manager.time.monotonic', clock.monotonic)
+    return clock
 
-    manager = RAGManager(client=mock_client)
+
+def test_create_file_search_store(client, tmp_path):
+    """Should create a file search store with given name."""
+    manager = RAGManager(client=client, config_path=tmp_path / "rag_store.json")
     store = manager.create_store(display_name="biochemistry-notes")
 
-    mock_client.file_search_stores.create.assert_called_once_with(config={"display_name": "biochemistry-notes"})
-    assert store.name == "stores/test-store-123"
+    assert client.file_search_stores.create_calls == [{"display_name": "biochemistry-notes"}]
+    assert store.name == STORE_NAME
 
 
 def test_rag_manager_requires_client():
     """RAGManager should require a client instance."""
-    from core.rag_manager import RAGManager
-
     with pytest.raises(TypeError):
         RAGManager()  # Missing required client argument
 
 
-def test_upload_file_to_store():
+def test_upload_file_to_store(client, manager):
     """Should upload a file to the store and wait for completion."""
-    mock_client = MagicMock()
-    mock_store = MagicMock()
-    mock_store.name = "stores/test-store-123"
-    mock_client.file_search_stores.create.return_value = mock_store
+    result = manager.upload_file(file_path="/path/to/textbook.pdf", display_name="Lehninger Ch1")
 
-    # Mock the upload operation
-    mock_operation = MagicMock()
-    mock_operation.done = True
-    mock_client.file_search_stores.upload_to_file_search_store.return_value = mock_operation
+    assert client.file_search_stores.upload_calls == [
+        ("/path/to/textbook.pdf", STORE_NAME, {"display_name": "Lehninger Ch1"})
+    ]
+    assert result is True
 
-    from core.rag_manager import RAGManager
 
-    manager = RAGManager(client=mock_client)
-    manager.create_store("test-store")
+def test_upload_file_raises_without_store():
+    """Should raise error if no store has been created."""
+    manager = RAGManager(client=FakeClient())
 
-    result = manager.upload_file(file_path="/path/to/textbook.pdf", display_name="Lehninger Ch1")
+    with pytest.raises(ValueError, match="store must be created"):
+        manager.upload_file(file_path="/path/to/file.pdf", display_name="test")
+
+
+def test_upload_file_polls_until_complete(client, manager, clock):
+    """Should poll operation until done, waiting longer between polls."""
+    # Operation starts not done, then becomes done after four polls
+    client.file_search_stores.upload_result = FakeOperation(remaining=4)
+
+    result = manager.upload_file(file_path="/path/to/file.pdf", display_name="test")
 
-    mock_client.file_search_stores.upload_to_file_search_store.assert_called_once()
     assert result is True
+    assert client.operations.get_calls == 4
+    assert all(earlier < later for earlier, later in zip(clock.sleeps, clock.sleeps[1:]))
 
 
-def test_upload_file_raises_without_store():
-    """Should raise error if no store has been created."""
-    mock_client = MagicMock()
+def test_upload_file_raises_on_timeout(client, manager, monkeypatch):
+    """Should raise TimeoutError if operation never completes."""
+    # Operation never completes
+    client.file_search_stores.upload_result = FakeOperation(remaining=NEVER)
 
-    from core.rag_manager import RAGManager
+    # Sleeping does nothing; the deadline alone must end the loop
+    monkeypatch.setattr('core.rag_manager.time.sleep', lambda seconds: None)
+    monkeypatch.setattr('core.rag_manager.time.monotonic', itertools.count(step=0.5).__next__)
 
-    manager = RAGManager(client=mock_client)
+    with pytest.raises(TimeoutError):
+        manager.upload_file(file_path="/path/to/file.pdf", display_name="test", timeout=5)
 
-    with pytest.raises(ValueError, match="store must be created"):
-        manager.upload_file(file_path="/path/to/file.pdf", display_name="test")
+    # Deadline at t=5; rounds run at t=0.5 through 4.5
+    assert client.operations.get_calls == 9
 
 
-def test_upload_file_polls_until_complete():
-    """Should poll operation until done."""
-    mock_client = MagicMock()
-    mock_store = MagicMock()
-    mock_store.name = "stores/test-store-123"
-    mock_client.file_search_stores.create.return_value = mock_store
+def test_upload_file_polls_through_throttling(client, manager, clock):
+    """A throttled status check should be retried, not fail an accepted upload."""
+    throttled = RuntimeError("429 RESOURCE_EXHAUSTED")
+    throttled.code = 429
+    client.file_search_stores.upload_result = FakeOperation(remaining=1)
+    client.operations.errors = [throttled]
 
-    # Operation starts not done, then becomes done after poll
-    mock_operation = MagicMock()
-    mock_operation.done = False
-    mock_client.file_search_stores.upload_to_file_search_store.return_value = mock_operation
+    assert manager.upload_file(file_path="/path/to/file.pdf", display_name="test") is True
 
-    # After first poll, operation is done
-    mock_polled_operation = MagicMock()
-    mock_polled_operation.done = True
-    mock_client.operations.get.return_value = mock_polled_operation
+    assert client.operations.get_calls == 2
+    assert len(client.file_search_stores.upload_calls) == 1
 
-    from core.rag_manager import RAGManager
 
-    manager = RAGManager(client=mock_client)
-    manager.create_store("test-store")
+def test_get_file_search_tool(manager):
+    """Should return Tool config for generate_content."""
+    tool = manager.get_file_search_tool()
 
-    # Mock time.sleep to avoid waiting
-    with patch('core.rag_manager.time.sleep'):
-        result = manager.upload_file(file_path="/path/to/file.pdf", display_name="test")
+    assert tool.file_search is not None
+    assert STORE_NAME in tool.file_search.file_search_store_names
 
-    assert result is True
-    mock_client.operations.get.assert_called()
 
+def test_get_file_search_tool_is_cached(manager):
+    """Repeated calls should reuse the same Tool object."""
+    assert manager.get_file_search_tool() is manager.get_file_search_tool()
 
-def test_upload_file_raises_on_timeout():
-    """Should raise TimeoutError if operation never completes."""
-    mock_client = MagicMock()
-    mock_store = MagicMock()
-    mock_store.name = "stores/test-store-123"
-    mock_client.file_search_stores.create.return_value = mock_store
 
+def test_get_file_search_tool_rebuilt_after_create_store(client, manager):
+    """Creating a new store should drop the tool cached for the old one."""
+    old_tool = manager.get_file_search_tool()
+
+    client.file_search_stores.store = FakeStore("stores/other-store")
+    manager.create_store("other-store")
+    new_tool = manager.get_file_search_tool()
+
+    assert new_tool is not old_tool
+    assert new_tool.file_search.file_search_store_names == ["stores/other-store"]
+
+
+def test_get_file_search_tool_raises_without_store():
+    """Should raise error if no store exists."""
+    manager = RAGManager(client=FakeClient())
+
+    with pytest.raises(ValueError, match="store must be created"):
+        manager.get_file_search_tool()
+
+
+def test_upload_file_backs_off_between_polls(client, manager, clock):
+    """Polling should start fast and grow the delay up to the cap."""
     # Operation never completes
-    mock_operation = MagicMock()
-    mock_operation.done = False
-    mock_client.file_search_stores.upload_to_file_search_store.return_value = mock_operation
-    mock_client.operations.get.return_value = mock_operation
+    client.file_search_stores.upload_result = FakeOperation(remaining=NEVER)
 
-    from core.rag_manager import RAGManager
+    with pytest.raises(TimeoutError):
+        manager.upload_file(file_path="/path/to/file.pdf", display_name="test", timeout=60)
 
-    manager = RAGManager(client=mock_client)
-    manager.create_store("test-store")
+    delays = clock.sleeps
+    assert POLL_INITIAL_DELAY <= delays[0] <= POLL_INITIAL_DELAY * (1 + POLL_JITTER)
+    assert delays == sorted(delays)
+    assert max(delays) <= POLL_MAX_DELAY
+
+
+def test_upload_file_backoff_capped(client, manager, clock):
+    """Long uploads should settle at the maximum delay, never above it."""
+    # Operation never completes
+    client.file_search_stores.upload_result = FakeOperation(remaining=NEVER)
 
-    # Mock time.sleep and use short timeout
-    with patch('core.rag_manager.time.sleep'):
+    with patch('core.rag_manager.random.uniform', return_value=0.1):
         with pytest.raises(TimeoutError):
-            manager.upload_file(file_path="/path/to/file.pdf", display_name="test", timeout=5)
+            manager.upload_file(file_path="/path/to/file.pdf", display_name="test", timeout=300)
 
+    assert max(clock.sleeps) == POLL_MAX_DELAY
+    assert clock.sleeps[-5:] == [POLL_MAX_DELAY] * 5
 
-def test_get_file_search_tool():
-    """Should return Tool config for generate_content."""
-    mock_client = MagicMock()
-    mock_store = MagicMock()
-    mock_store.name = "stores/test-store-123"
-    mock_client.file_search_stores.create.return_value = mock_store
 
-    from core.rag_manager import RAGManager
+def test_upload_file_async_returns_future(manager):
+    """Background uploads should resolve to the upload_file result."""
+    future = manager.upload_file_async(file_path="/path/to/file.pdf", display_name="test")
+
+    assert future.result(timeout=5) is True
+
 
-    manager = RAGManager(client=mock_client)
+def test_create_store_saves_config(tmp_path):
+    """Creating a store should persist its name without leaving temp files."""
+    config_path = tmp_path / "rag_store.json"
+    manager = RAGManager(client=FakeClient(), config_path=config_path)
     manager.create_store("test-store")
 
-    tool = manager.get_file_search_tool()
+    assert json.loads(config_path.read_text()) == {"store_name": STORE_NAME}
+    assert list(tmp_path.iterdir()) == [config_path]
 
-    assert tool.file_search is not None
-    assert "stores/test-store-123" in tool.file_search.file_search_store_names
 
+def test_save_config_skips_unchanged_store(tmp_path):
+    """Saving the same store name twice should only write once."""
+    manager = RAGManager(client=FakeClient(), config_path=tmp_path / "rag_store.json")
+    manager.create_store("test-store")
+
+    with patch("core.rag_manager.os.replace") as mock_replace:
+        manager.create_store("test-store")
+
+    mock_replace.assert_not_called()
+
+
+def test_load_existing_store_from_config(tmp_path):
+    """A saved store name should be loaded and verified with Gemini."""
+    client = FakeClient()
+    config_path = tmp_path / "rag_store.json"
+    config_path.write_text('{"store_name": "stores/saved-store"}')
+
+    manager = RAGManager(client=client, config_path=config_path)
+
+    assert manager.load_existing_store() is True
+    assert manager.store_name == "stores/saved-store"
+    assert client.file_search_stores.get_calls == ["stores/saved-store"]
 
-def test_get_file_search_tool_raises_without_store():
-    """Should raise error if no store exists."""
-    mock_client = MagicMock()
 
-    from core.rag_manager import RAGManager
+def test_config_round_trip_without_orjson(tmp_path):
+    """The stdlib json fallback should read back what it wrote."""
+    client = FakeClient()
 
-    manager = RAGManager(client=mock_client)
+    config_path = tmp_path / "rag_store.json"
+    with patch("core.rag_manager.orjson", None):
+        RAGManager(client=client, config_path=config_path).create_store("test-store")
+        manager = RAGManager(client=client, config_path=config_path)
+
+        assert manager.load_existing_store() is True
+    assert manager.store_name == STORE_NAME
+
+
+def test_upload_files_async_uploads_every_item(client, manager):
+    """Each (path, name) pair should be uploaded and get its own Future."""
+    items = [("/path/to/unidad1.pdf", "Unidad 1"), ("/path/to/unidad2.pdf", "Unidad 2")]
+    futures = manager.upload_files_async(items)
+
+    assert [future.result(timeout=5) for future in futures] == [True, True]
+    assert len(client.file_search_stores.upload_calls) == 2
+
+
+def test_get_document_count_is_cached(client, manager):
+    """Document count should only be listed once within the TTL."""
+    client.file_search_stores.files.documents = ["doc1", "doc2"]
+
+    assert manager.get_document_count() == 2
+    assert manager.get_document_count() == 2
+    assert client.file_search_stores.files.list_calls == 1
+
+
+def test_get_document_count_refreshes_after_upload(client, manager):
+    """A completed upload should invalidate the cached count."""
+    client.file_search_stores.files.documents = ["doc1"]
+
+    assert manager.get_document_count() == 1
+
+    client.file_search_stores.files.documents = ["doc1", "doc2"]
+    manager.upload_file(file_path="/path/to/file.pdf", display_name="test")
+
+    assert manager.get_document_count() == 2
+
+
+def test_get_document_count_refreshes_after_create_store(client, manager):
+    """A new store should not report the previous store's count."""
+    client.file_search_stores.files.documents = ["doc1", "doc2"]
+    assert manager.get_document_count() == 2
+
+    client.file_search_stores.files.documents = []
+    manager.create_store("other-store")
+
+    assert manager.get_document_count() == 0
+
+
+def test_get_document_count_refreshes_after_load_existing_store(client, manager):
+    """Loading another store should drop the cached count."""
+    client.file_search_stores.files.documents = ["doc1", "doc2"]
+    assert manager.get_document_count() == 2
+
+    client.file_search_stores.files.documents = ["doc1"]
+    assert manager.load_existing_store("stores/other-store") is True
+
+    assert manager.get_document_count() == 1
+
+
+def test_upload_files_async_share_one_poller(client, manager):
+    """Concurrent uploads should be polled once per sweep, not once per worker."""
+    def start_upload(file, file_search_store_name, config):
+        return FakeOperation(name=f"operations/{config['display_name']}", remaining=2)
+
+    client.file_search_stores.upload_result = start_upload
+
+    items = [(f"/path/to/unidad{i}.pdf", f"Unidad {i}") for i in range(4)]
+    with patch('core.rag_manager.POLL_BUS_INTERVAL', 0.01), \
+            patch('core.rag_manager.POLL_INITIAL_DELAY', 0.01):
+        futures = manager.upload_files_async(items)
+        results = [future.result(timeout=5) for future in futures]
+
+    assert results == [True] * 4
+    # Two sweeps per operation, never more
+    assert client.operations.get_calls == 8
+
+
+def test_upload_file_shared_poll_from_threads(client, manager):
+    """Blocking uploads from several threads can share the single poller."""
+    def start_upload(file, file_search_store_name, config):
+        return FakeOperation(name=f"operations/{config['display_name']}", remaining=2)
+
+    client.file_search_stores.upload_result = start_upload
+
+    with patch('core.rag_manager.POLL_BUS_INTERVAL', 0.01), \
+            patch('core.rag_manager.POLL_INITIAL_DELAY', 0.01), \
+            ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [
+            executor.submit(manager.upload_file, f"/path/to/unidad{i}.pdf", f"Unidad {i}", 5, shared_poll=True)
+            for i in range(4)
+        ]
+        results = [future.result(timeout=5) for future in futures]
+
+    assert results == [True] * 4
+    # Two sweeps per operation, never more
+    assert client.operations.get_calls == 8
+
+
+def test_shared_poller_backs_off_per_operation(client, manager, clock):
+    """A 15-minute upload should cost the same status calls as a lone backoff loop."""
+    calls = []
+
+    def get(operation):
+        calls.append(clock.now)
+        return FakeOperation(name=operation.name, remaining=0 if clock.now >= 900 else NEVER)
+
+    client.operations.get = get
+    client.file_search_stores.upload_result = FakeOperation(remaining=NEVER)
+
+    assert manager.upload_file("/path/to/file.pdf", "Libro", timeout=5, shared_poll=True) is True
+
+    # 0.5 s growing x1.8 to a 10 s cap: about 95 polls, not one per second
+    assert len(calls) < 100
+    assert all(later - earlier >= POLL_INITIAL_DELAY for earlier, later in zip(calls, calls[1:]))
+    assert calls[-1] - calls[-2] >= POLL_MAX_DELAY
+
+
+def test_upload_file_async_propagates_poll_errors(client, manager):
+    """An error while polling should fail that upload's Future."""
+    client.file_search_stores.upload_result = FakeOperation(name="operations/unidad1", remaining=NEVER)
+    client.operations.error = RuntimeError("quota")
+
+    with patch('core.rag_manager.POLL_BUS_INTERVAL', 0.01), \
+            patch('core.rag_manager.POLL_INITIAL_DELAY', 0.01):
+        future = manager.upload_file_async(file_path="/path/to/file.pdf", display_name="test")
+
+        with pytest.raises(RuntimeError, match="quota"):
+            future.result(timeout=5)
+
+
+def test_upload_files_batch(client, manager, clock):
+    """A batch should share one polling loop and only refresh pending uploads."""
+    def start_upload(file, file_search_store_name, config):
+        # Unidad 0 finishes on the first poll, the others on the third
+        remaining = 1 if config["display_name"].endswith("0") else 3
+        return FakeOperation(name=f"operations/{config['display_name']}", remaining=remaining)
+
+    client.file_search_stores.upload_result = start_upload
+
+    items = [(f"/path/to/unidad{i}.pdf", f"Unidad {i}") for i in range(5)]
+    assert manager.upload_files(items) is True
+
+    assert len(client.file_search_stores.upload_calls) == len(items)
+    # Sleeps follow poll rounds, not the number of files
+    assert len(clock.sleeps) == 3
+    assert client.operations.get_calls == 1 + 3 * 4
+
+
+def test_upload_files_raises_on_timeout(client, manager, clock):
+    """Uploads still pending after the timeout should be reported."""
+    client.file_search_stores.upload_result = FakeOperation(remaining=NEVER)
+
+    with pytest.raises(TimeoutError, match="Unidad 1"):
+        manager.upload_files([("/path/to/unidad1.pdf", "Unidad 1")], timeout=5)
+
+
+def test_aupload_files_concurrency(client, manager):
+    """Async uploads should overlap up to the concurrency limit and no further."""
+    client.aio.file_search_stores.upload_delay = 0.01
+
+    items = [(f"/path/to/unidad{i}.pdf", f"Unidad {i}") for i in range(12)]
+    results = asyncio.run(manager.aupload_files(items, concurrency=4))
+
+    assert results == [True] * 12
+    assert len(client.aio.file_search_stores.upload_calls) == 12
+    assert client.aio.file_search_stores.peak_in_flight == 4
+
+
+def test_aupload_files_polls_pending_operations(client, manager):
+    """Unfinished operations should be polled with the async client."""
+    client.aio.file_search_stores.remaining = 1
+
+    items = [("/path/to/unidad1.pdf", "Unidad 1"), ("/path/to/unidad2.pdf", "Unidad 2")]
+    with patch('core.rag_manager.POLL_INITIAL_DELAY', 0):
+        results = asyncio.run(manager.aupload_files(items))
+
+    assert results == [True, True]
+    assert client.aio.operations.get_calls == 2
+    assert client.operations.get_calls == 0
+
+
+def test_aupload_files_raises_without_store():
+    """Should raise error if no store has been created."""
+    manager = RAGManager(client=FakeClient())
 
     with pytest.raises(ValueError, match="store must be created"):
-        manager.get_file_search_tool()
+        asyncio.run(manager.aupload_files([("/path/to/file.pdf", "test")]))
@@ -0,0 +1,75 @@
+# tests/test_response_cache.py
+from unittest.mock import patch
+
+
+def test_make_key_ignores_tool_order():
+    """Enabling the same tools in a different order should hit the same entry."""
+    from core.response_cache import make_key
+
+    key_a = make_key("¿Qué es la Km?", "model", "system", ["calculate_ph", "enzyme_kinetics"])
+    key_b = make_key("¿Qué es la Km?", "model", "system", ["enzyme_kinetics", "calculate_ph"])
+
+    assert key_a == key_b
+
+
+def test_make_key_changes_with_store():
+    """A different file search store must not share cached answers."""
+    from core.response_cache import make_key
+
+    key_a = make_key("prompt", "model", "system", [], "stores/a")
+    key_b = make_key("prompt", "model", "system", [], "stores/b")
+
+    assert key_a != key_b
+
+
+def test_make_key_separates_parts():
+    """Moving characters between parts must change the key."""
+    from core.response_cache import make_key
+
+    key_a = make_key("ab", "c", "system", [])
+    key_b = make_key("a", "bc", "system", [])
+
+    assert key_a != key_b
+    assert len(key_a) == 16
+
+
+def test_get_returns_cached_text():
+    """Stored responses should be returned on lookup."""
+    from core.response_cache import ResponseCache
+
+    cache = ResponseCache()
+    cache.set(b"key", "La Km es la concentración de sustrato a Vmax/2")
+
+    assert cache.get(b"key") == "La Km es la concentración de sustrato a Vmax/2"
+    assert cache.get(b"missing") is None
+
+
+def test_get_expires_after_ttl():
+    """Entries older than the TTL should be treated as missing."""
+    from core.response_cache import ResponseCache
+
+    cache = ResponseCache(ttl=10)
+
+    with patch("core.response_cache.time.monotonic", return_value=100.0):
+        cache.set(b"key", "respuesta")
+    with patch("core.response_cache.time.monotonic", return_value=109.0):
+        assert cache.get(b"key") == "respuesta"
+    with patch("core.response_cache.time.monotonic", return_value=111.0):
+        assert cache.get(b"key") is None
+
+    assert len(cache) == 0
+
+
+def test_set_evicts_least_recently_used():
+    """When full, the least recently used entry should be evicted."""
+    from core.response_cache import ResponseCache
+
+    cache = ResponseCache(max_entries=2)
+    cache.set(b"a", "1")
+    cache.set(b"b", "2")
+    cache.get(b"a")  # "b" is now the least recently used
+    cache.set(b"c", "3")
+
+    assert cache.get(b"a") == "1"
+    assert cache.get(b"b") is None
+    assert cache.get(b"c") == "3"
@@ -0,0 +1,112 @@
+# tests/test_semantic_cache.py
+from unittest.mock import MagicMock
+
+import numpy as np
+
+
+def _client_with_embeddings(vectors: dict):
+    """Build a mock client whose embed_content returns the given vectors."""
+    mock_client = MagicMock()
+
+    def embed_content(model, contents, config=None):
+        result = MagicMock()
+        result.embeddings = [MagicMock(values=vectors[contents])]
+        return result
+
+    mock_client.models.embed_content.side_effect = embed_content
+    return mock_client
+
+
+def test_embed_returns_unit_vector():
+    """Embeddings should be L2-normalized float32 vectors."""
+    from core.semantic_cache import SemanticCache
+
+    cache = SemanticCache(client=_client_with_embeddings({"hola": [3.0, 4.0]}))
+
+    vector = cache.embed("hola")
+
+    assert vector.dtype == np.float32
+    assert abs(np.linalg.norm(vector) - 1.0) < 1e-6
+
+
+def test_embed_returns_none_on_api_error():
+    """A failed embedding call should not break the chat flow."""
+    from core.semantic_cache import SemanticCache
+
+    mock_client = MagicMock()
+    mock_client.models.embed_content.side_effect = RuntimeError("quota")
+    cache = SemanticCache(client=mock_client)
+
+    assert cache.embed("¿Qué es la glucólisis?") is None
+
+
+def test_lookup_returns_answer_for_paraphrase():
+    """Similar prompts under the same scope should reuse the answer."""
+    from core.semantic_cache import SemanticCache
+
+    cache = SemanticCache(client=_client_with_embeddings({
+        "¿Qué es la glucólisis?": [1.0, 0.0, 0.0],
+        "Explícame la glucólisis": [0.99, 0.05, 0.0],
+        "¿Qué es el ciclo de Krebs?": [0.0, 1.0, 0.0],
+    }))
+
+    cache.add(cache.embed("¿Qué es la glucólisis?"), b"scope", "La glucólisis es...")
+
+    assert cache.lookup(cache.embed("Explícame la glucólisis"), b"scope") == "La glucólisis es..."
+    assert cache.lookup(cache.embed("¿Qué es el ciclo de Krebs?"), b"scope") is None
+
+
+def test_lookup_is_isolated_by_scope():
+    """Answers generated with other settings should not be reused."""
+    from core.semantic_cache import SemanticCache
+
+    cache = SemanticCache(client=_client_with_embeddings({"pregunta": [1.0, 0.0]}))
+    vector = cache.embed("pregunta")
+    cache.add(vector, b"scope-a", "respuesta")
+
+    assert cache.lookup(vector, b"scope-b") is None
+
+
+def test_add_evicts_oldest_when_full():
+    """Entries beyond max_entries should replace the oldest one."""
+    from core.semantic_cache import SemanticCache
+
+    cache = SemanticCache(client=MagicMock(), max_entries=2)
+    first = np.array([1.0, 0.0, 0.0], dtype=np.float32)
+    second = np.array([0.0, 1.0, 0.0], dtype=np.float32)
+    third = np.array([0.0, 0.0, 1.0], dtype=np.float32)
+
+    cache.add(first, b"scope", "uno")
+    cache.add(second, b"scope", "dos")
+    cache.add(third, b"scope", "tres")
+
+    assert len(cache) == 2
+    assert cache.lookup(first, b"scope") is None
+    assert cache.lookup(second, b"scope") == "dos"
+    assert cache.lookup(third, b"scope") == "tres"
+
+
+def test_is_semantically_cacheable_for_plain_questions():
+    """Conceptual questions without tools can reuse paraphrased answers."""
+    from core.semantic_cache import is_semantically_cacheable
+
+    assert is_semantically_cacheable("¿Qué es la glucólisis?", [])
+
+
+def test_is_semantically_cacheable_skips_numbers_and_tools():
+    """Calculations and study sets must never be served from a near match."""
+    from core.semantic_cache import is_semantically_cacheable
+
+    assert not is_semantically_cacheable("pH con pKa 4.76, 0.1 M ácido y 0.05 M base", [])
+    assert not is_semantically_cacheable("Calcula el pH del tampón", ["calculate_ph"])
+    assert not is_semantically_cacheable("Hazme flashcards de enzimas", ["create_flashcards"])
+
+
+def test_generates_study_set():
+    """Flashcard and exam requests must get a new set every time."""
+    from core.semantic_cache import generates_study_set
+
+    assert generates_study_set(["create_exam"])
+    assert generates_study_set(["calculate_ph", "create_flashcards"])
+    assert not generates_study_set(["calculate_ph"])
+    assert not generates_study_set([])
@@ -0,0 +1,37 @@
+# tests/test_tool_configs.py
+
+
+def test_build_config_is_reused():
+    """The same prompt and tools should return the same config object."""
+    from core.tool_configs import build_config
+
+    first = build_config("Eres Rosalind", ("calculate_ph",))
+    second = build_config("Eres Rosalind", ("calculate_ph",))
+
+    assert first is second
+
+
+def test_build_config_attaches_named_tools_and_store():
+    """Function tools are looked up by name and file search by store."""
+    from core.tool_configs import build_config
+    from core.tools import enzyme_kinetics
+
+    config = build_config("Eres Rosalind", ("enzyme_kinetics",), "stores/test-store-123")
+
+    assert config.system_instruction == "Eres Rosalind"
+    assert config.tools[0] is enzyme_kinetics
+    assert config.tools[1].file_search.file_search_store_names == ["stores/test-store-123"]
+
+
+def test_build_config_without_tools():
+    """No tools should leave the tools field unset."""
+    from core.tool_configs import build_config
+
+    assert build_config("Eres Rosalind").tools is None
+
+
+def test_default_config_has_every_tool():
+    """The default config should attach all function tools."""
+    from core.tool_configs import DEFAULT_CONFIG, TOOLS_ALL
+
+    assert tuple(DEFAULT_CONFIG.tools) == TOOLS_ALL
@@ -0,0 +1,47 @@
+# tests/test_tool_router.py
+import pytest
+
+AVAILABLE = {
+    "calculate_ph": "ph",
+    "enzyme_kinetics": "kinetics",
+    "isoelectric_point": "pi",
+    "create_flashcards": "flashcards",
+    "create_exam": "exam",
+    "file_search": "rag",
+}
+
+
+@pytest.mark.parametrize("prompt,expected", [
+    ("Calcula el pH con pKa 4.76", ["ph", "pi", "rag"]),
+    ("¿Vmax?", ["kinetics"]),
+    ("¿Cuál es el punto isoeléctrico de la glicina?", ["pi", "rag"]),
+    ("Hazme flashcards", ["flashcards", "rag"]),
+])
+def test_select_tools_matches_topic(prompt, expected):
+    """Only the tools matching the prompt's topic should be attached."""
+    from core.tool_router import select_tools
+
+    assert select_tools(prompt, AVAILABLE) == expected
+
+
+def test_select_tools_pure_definition_skips_calculators():
+    """Conceptual questions should only use the documents."""
+    from core.tool_router import select_tools
+
+    assert select_tools("¿Qué es la glucólisis anaerobia?", AVAILABLE) == ["rag"]
+
+
+def test_select_tools_generic_calculation_attaches_all_calculators():
+    """A calculation request without a known topic keeps every calculator."""
+    from core.tool_router import select_tools
+
+    assert select_tools("calcula esto", AVAILABLE) == ["ph", "kinetics", "pi"]
+
+
+def test_select_tools_respects_disabled_tools():
+    """Tools disabled in the sidebar are never attached."""
+    from core.tool_router import select_tools
+
+    available = {"enzyme_kinetics": "kinetics"}
+
+    assert select_tools("Calcula el pH del buffer", available) == []
@@ -1,97 +1,118 @@
 # tests/test_tools.py
-import pytest
-import math
-
-
-def test_calculate_ph_basic_buffer():
-    """pH calculation using Henderson-Hasselbalch equation."""
-    from core.tools import calculate_ph
+import inspect
+import re
+from itertools import permutations
 
-    # Acetic acid buffer: pKa=4.76, [A-]=0.05M, [HA]=0.1M
-    result = calculate_ph(pka=4.76, acid_conc=0.1, base_conc=0.05)
+import numpy as np
+import pytest
 
-    # pH = pKa + log([A-]/[HA]) = 4.76 + log(0.5) = 4.76 - 0.301 = 4.459
-    assert abs(result - 4.459) < 0.01
+from core.tools import calculate_ph, create_exam, create_flashcards, enzyme_kinetics, isoelectric_point
 
+# Title, question type, both options and the check mark, in that order
+_MULTIPLE_CHOICE_RE = re.compile(r"(?s)Examen: Glucólisis.*\[Opción Múltiple\].*A\) Hexoquinasa.*B\) PFK-1.*✓")
 
-def test_calculate_ph_equal_concentrations():
-    """When acid and base concentrations are equal, pH equals pKa."""
-    from core.tools import calculate_ph
 
-    result = calculate_ph(pka=7.0, acid_conc=0.1, base_conc=0.1)
+@pytest.mark.parametrize("pka,acid,base,expected,tolerance", [
+    # Acetic acid buffer: pH = 4.76 + log(0.05/0.1) = 4.76 - 0.301 = 4.459
+    (4.76, 0.1, 0.05, 4.459, 0.01),
+    # Equal concentrations: pH equals pKa
+    (7.0, 0.1, 0.1, 7.0, 0.001),
+])
+def test_calculate_ph(pka, acid, base, expected, tolerance):
+    """pH calculation using Henderson-Hasselbalch equation."""
+    result = calculate_ph(pka=pka, acid_conc=acid, base_conc=base)
 
-    assert abs(result - 7.0) < 0.001
+    assert abs(result - expected) < tolerance
 
 
 def test_calculate_ph_raises_on_zero_concentration():
     """Zero concentration should raise ValueError."""
-    from core.tools import calculate_ph
-
     with pytest.raises(ValueError, match="must be positive"):
         calculate_ph(pka=4.76, acid_conc=0, base_conc=0.1)
 
 
-def test_enzyme_kinetics_half_vmax():
-    """When [S] = Km, velocity should be Vmax/2."""
-    from core.tools import enzyme_kinetics
+def test_calculate_ph_vectorized():
+    """Array concentrations should match the scalar result element by element."""
+    acid = np.array([0.1, 0.2, 0.3])
+    base = np.array([0.3, 0.2, 0.1])
+
+    result = calculate_ph(pka=4.76, acid_conc=acid, base_conc=base)
 
-    result = enzyme_kinetics(v_max=100, km=10, substrate_conc=10)
+    expected = [calculate_ph(pka=4.76, acid_conc=float(a), base_conc=float(b)) for a, b in zip(acid, base)]
+    np.testing.assert_allclose(result, expected)
 
-    assert abs(result - 50.0) < 0.01
 
+def test_calculate_ph_zero_dim_array_returns_float():
+    """0-d arrays should come back as a plain float."""
+    result = calculate_ph(pka=7.0, acid_conc=np.float32(0.1), base_conc=0.1)
 
-def test_enzyme_kinetics_high_substrate():
-    """At very high [S], velocity approaches Vmax."""
-    from core.tools import enzyme_kinetics
+    assert type(result) is float
+    assert abs(result - 7.0) < 1e-6
 
-    result = enzyme_kinetics(v_max=100, km=10, substrate_conc=1000)
 
-    assert result > 99.0  # Should be close to Vmax
+def test_calculate_ph_vectorized_raises_on_zero():
+    """One invalid concentration should reject the whole array."""
+    with pytest.raises(ValueError, match="must be positive"):
+        calculate_ph(pka=4.76, acid_conc=np.array([0.1, 0.0]), base_conc=0.1)
+
+
+@pytest.mark.parametrize("substrate,expected", [
+    # [S] = Km: velocity is Vmax/2
+    (10, 50.0),
+    # [S] >> Km: velocity approaches Vmax
+    (1000, 99.01),
+    # No substrate, no reaction
+    (0, 0.0),
+])
+def test_enzyme_kinetics(substrate, expected):
+    """Michaelis-Menten velocity for Vmax=100, Km=10."""
+    result = enzyme_kinetics(v_max=100, km=10, substrate_conc=substrate)
+
+    assert abs(result - expected) < 0.01
 
 
 def test_enzyme_kinetics_raises_on_invalid_params():
     """Negative or zero parameters should raise ValueError."""
-    from core.tools import enzyme_kinetics
-
     with pytest.raises(ValueError):
         enzyme_kinetics(v_max=-100, km=10, substrate_conc=5)
 
 
-def test_isoelectric_point_glycine():
-    """Glycine pI is average of pKa1 (2.34) and pKa2 (9.60)."""
-    from core.tools import isoelectric_point
-
-    result = isoelectric_point(pka_values=[2.34, 9.60])
-
-    assert abs(result - 5.97) < 0.01
-
+def test_enzyme_kinetics_vector():
+    """A substrate sweep should match the scalar equation at every point."""
+    substrate = np.logspace(-2, 3, 1000)
 
-def test_isoelectric_point_aspartate():
-    """Acidic amino acid uses two lowest pKa values."""
-    from core.tools import isoelectric_point
+    result = enzyme_kinetics(v_max=100, km=10, substrate_conc=substrate)
 
-    # Aspartate: pKa1=1.88, pKa2=3.65, pKa3=9.60
-    # pI = (1.88 + 3.65) / 2 = 2.77
-    result = isoelectric_point(pka_values=[1.88, 3.65, 9.60])
+    assert result.shape == (1000,)
+    np.testing.assert_allclose(result, 100 * substrate / (10 + substrate))
+    assert np.all(np.diff(result) > 0)
 
-    assert abs(result - 2.77) < 0.01
 
+@pytest.mark.parametrize("pka_values,expected", [
+    # Glycine: average of pKa1 and pKa2
+    ([2.34, 9.60], 5.97),
+    # Two values are averaged directly, in any order
+    ([9.60, 2.34], 5.97),
+    # Aspartate (acidic): two lowest, (1.88 + 3.65) / 2
+    ([1.88, 3.65, 9.60], 2.77),
+    # Lysine (basic): two highest, (8.95 + 10.53) / 2
+    ([2.18, 8.95, 10.53], 9.74),
+])
+def test_isoelectric_point(pka_values, expected):
+    """pI is the average of the two pKa values bracketing the zwitterion."""
+    result = isoelectric_point(pka_values=pka_values)
 
-def test_isoelectric_point_lysine():
-    """Basic amino acid uses two highest pKa values."""
-    from core.tools import isoelectric_point
+    assert abs(result - expected) < 0.01
 
-    # Lysine: pKa1=2.18, pKa2=8.95, pKa3=10.53
-    # pI = (8.95 + 10.53) / 2 = 9.74
-    result = isoelectric_point(pka_values=[2.18, 8.95, 10.53])
 
-    assert abs(result - 9.74) < 0.01
+def test_isoelectric_point_ignores_input_order():
+    """Unsorted pKa lists should give the same pI as sorted ones."""
+    for pkas in permutations([1.88, 3.65, 9.60]):
+        assert abs(isoelectric_point(pka_values=list(pkas)) - 2.765) < 1e-9
 
 
 def test_isoelectric_point_raises_on_insufficient_pkas():
     """Need at least 2 pKa values."""
-    from core.tools import isoelectric_point
-
     with pytest.raises(ValueError, match="[Aa]t least 2"):
         isoelectric_point(pka_values=[4.5])
 
@@ -99,8 +120,6 @@ def test_isoelectric_point_raises_on_insufficient_pkas():
 # Tests for create_flashcards
 def test_create_flashcards_basic():
     """Create flashcards with valid input."""
-    from core.tools import create_flashcards
-
     cards = [
         {"pregunta": "¿Qué es la Km?", "respuesta": "Concentración de sustrato a Vmax/2"},
         {"pregunta": "¿Qué es Vmax?", "respuesta": "Velocidad máxima de reacción"}
@@ -114,10 +133,20 @@ def test_create_flashcards_basic():
     assert "Concentración de sustrato" in result
 
 
+def test_create_flashcards_exact_format():
+    """Output format should stay stable for the chat renderer."""
+    result = create_flashcards(topic="pH", cards=[{"pregunta": "¿pKa?", "respuesta": "-log Ka"}])
+
+    assert result == (
+        "📚 **Flashcards: pH**\n\n"
+        "🔹 **Tarjeta 1**\n"
+        "**Pregunta:** ¿pKa?\n"
+        "**Respuesta:** -log Ka"
+    )
+
+
 def test_create_flashcards_empty_raises():
     """Empty cards list should raise ValueError."""
-    from core.tools import create_flashcards
-
     with pytest.raises(ValueError, match="al menos una tarjeta"):
         create_flashcards(topic="Enzimas", cards=[])
 
@@ -125,8 +154,6 @@ def test_create_flashcards_empty_raises():
 # Tests for create_exam
 def test_create_exam_multiple_choice():
     """Create exam with multiple choice questions."""
-    from core.tools import create_exam
-
     questions = [
         {
             "tipo": "opcion_multiple",
@@ -138,17 +165,11 @@ def test_create_exam_multiple_choice():
     ]
     result = create_exam(topic="Glucólisis", questions=questions)
 
-    assert "Examen: Glucólisis" in result
-    assert "[Opción Múltiple]" in result
-    assert "A) Hexoquinasa" in result
-    assert "B) PFK-1" in result
-    assert "✓" in result
+    assert _MULTIPLE_CHOICE_RE.search(result), f"Unexpected exam layout:\n{result}"
 
 
 def test_create_exam_true_false():
     """Create exam with true/false questions."""
-    from core.tools import create_exam
-
     questions = [
         {
             "tipo": "verdadero_falso",
@@ -167,8 +188,6 @@ def test_create_exam_true_false():
 
 def test_create_exam_mixed():
     """Create exam with mixed question types."""
-    from core.tools import create_exam
-
     questions = [
         {
             "tipo": "opcion_multiple",
@@ -191,9 +210,28 @@ def test_create_exam_mixed():
     assert "[V/F]" in result
 
 
+def test_create_exam_too_many_options_raises():
+    """Options past Z must not be dropped silently."""
+    question = {
+        "tipo": "opcion_multiple",
+        "pregunta": "¿Cuál?",
+        "opciones": [f"Opción {n}" for n in range(27)],
+        "respuesta_correcta": "A",
+        "explicacion": "",
+    }
+
+    with pytest.raises(ValueError, match="como máximo 26 opciones"):
+        create_exam(topic="Test", questions=[question])
+
+
 def test_create_exam_empty_raises():
     """Empty questions list should raise ValueError."""
-    from core.tools import create_exam
-
     with pytest.raises(ValueError, match="al menos una pregunta"):
         create_exam(topic="Test", questions=[])
+
+
+def test_numeric_tools_keep_python_signatures():
+    """Gemini builds declarations from signatures, so JIT must not wrap the tools."""
+    assert list(inspect.signature(calculate_ph).parameters) == ["pka", "acid_conc", "base_conc"]
+    assert list(inspect.signature(enzyme_kinetics).parameters) == ["v_max", "km", "substrate_conc"]
+    assert "Henderson-Hasselbalch" in calculate_ph.__doc__
@@ -0,0 +1,32 @@
+# tests/test_tools_numba.py
+import numpy as np
+
+from core.tools_numba import (
+    henderson_hasselbalch, henderson_hasselbalch_batch, michaelis_menten, michaelis_menten_batch,
+)
+
+
+def test_henderson_hasselbalch_batch_matches_scalar():
+    """The batch kernel should agree with the scalar kernel at every point."""
+    acid = np.array([0.1, 0.2, 0.05])
+    base = np.array([0.05, 0.2, 0.1])
+
+    result = henderson_hasselbalch_batch(4.76, acid, base)
+
+    expected = [henderson_hasselbalch(4.76, a, b) for a, b in zip(acid, base)]
+    np.testing.assert_allclose(result, expected)
+
+
+def test_michaelis_menten_batch_matches_scalar():
+    """The batch kernel should agree with the scalar kernel at every point."""
+    substrate = np.logspace(-2, 3, 50)
+
+    result = michaelis_menten_batch(100.0, 10.0, substrate)
+
+    np.testing.assert_allclose(result, [michaelis_menten(100.0, 10.0, s) for s in substrate])
+
+
+def test_scalar_kernels_return_floats():
+    """Scalar kernels should hand plain floats back to the tools."""
+    assert isinstance(henderson_hasselbalch(7.0, 0.1, 0.1), float)
+    assert michaelis_menten(100, 10, 10) == 50.0
@@ -0,0 +1,87 @@
+# tests/test_tools_vectorized.py
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from core import tools, tools_numba
+from core.tools_vectorized import calculate_ph, enzyme_kinetics, isoelectric_point
+
+
+def test_calculate_ph_matches_scalar_version():
+    """Array results should match the scalar tool element by element."""
+    acid = [0.1, 0.2, 0.05]
+    base = [0.05, 0.2, 0.1]
+
+    result = calculate_ph(4.76, acid, base)
+
+    expected = [tools.calculate_ph(4.76, a, b) for a, b in zip(acid, base)]
+    np.testing.assert_allclose(result, expected)
+
+
+def test_calculate_ph_raises_if_any_concentration_is_not_positive():
+    """A single invalid element should reject the whole batch."""
+    with pytest.raises(ValueError, match="must be positive"):
+        calculate_ph(4.76, [0.1, 0.0], [0.1, 0.1])
+
+
+def test_enzyme_kinetics_substrate_sweep():
+    """A Km sweep should give Vmax/2 at [S] = Km and approach Vmax."""
+    result = enzyme_kinetics(100, 10, [10, 1000])
+
+    np.testing.assert_allclose(result, [50.0, 100 * 1000 / 1010])
+
+
+def test_enzyme_kinetics_allows_zero_substrate():
+    """[S] = 0 is a valid point on the curve (v = 0)."""
+    np.testing.assert_allclose(enzyme_kinetics(100, 10, [0.0, 10.0]), [0.0, 50.0])
+
+
+def test_enzyme_kinetics_raises_on_negative_parameter():
+    """Negative parameters should raise ValueError."""
+    with pytest.raises(ValueError, match="must be positive"):
+        enzyme_kinetics(100, [10, -1], 5)
+
+
+def test_isoelectric_point_rows():
+    """Each row should follow the scalar acidic/basic heuristic."""
+    rows = [[1.88, 9.60, 3.65], [2.18, 8.95, 10.53]]
+
+    result = isoelectric_point(rows)
+
+    np.testing.assert_allclose(result, [tools.isoelectric_point(row) for row in rows])
+
+
+def test_isoelectric_point_two_values():
+    """Simple amino acids should average both pKa values."""
+    np.testing.assert_allclose(isoelectric_point([2.34, 9.60]), [5.97])
+
+
+def test_isoelectric_point_raises_on_wrong_column_count():
+    """Rows must contain 2 or 3 pKa values."""
+    with pytest.raises(ValueError, match="At least 2"):
+        isoelectric_point([[2.34]])
+    with pytest.raises(ValueError, match="Expected 2 or 3"):
+        isoelectric_point([[1.0, 2.0, 3.0, 4.0]])
+
+
+def test_one_dimensional_sweeps_use_batch_kernels():
+    """1-D inputs with scalar constants should run on the tools_numba batch kernels."""
+    with patch("core.tools_vectorized.henderson_hasselbalch_batch",
+               wraps=tools_numba.henderson_hasselbalch_batch) as ph_batch, \
+            patch("core.tools_vectorized.michaelis_menten_batch",
+                  wraps=tools_numba.michaelis_menten_batch) as mm_batch:
+        calculate_ph(4.76, [0.1, 0.2], [0.05, 0.2])
+        enzyme_kinetics(100, 10, [10, 1000])
+
+    ph_batch.assert_called_once()
+    mm_batch.assert_called_once()
+
+
+def test_broadcast_inputs_fall_back_to_numpy():
+    """Grids and per-point constants should still broadcast."""
+    grid = calculate_ph(4.76, [[0.1], [0.2]], [0.1, 0.2])
+    velocities = enzyme_kinetics([100, 200], [10, 10], 10)
+
+    np.testing.assert_allclose(grid, 4.76 + np.log10(np.array([[1.0, 2.0], [0.5, 1.0]])))
+    np.testing.assert_allclose(velocities, [50.0, 100.0])